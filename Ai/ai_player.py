@@ -5,6 +5,7 @@ import os
 import importlib.util
 from . import heuristics
 from . import minimax
+from Core.moves import is_wall_move
 # Dynamic import for pathfinding in Core folder
 pathfinding_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Core', 'pathfinding.py'))
 import importlib.util
@@ -30,11 +31,17 @@ class AIPlayer:
             self.depth = 1  # default easy
 
     def choose_action(self, board):
+        # The search applies moves for board.current_player
+        if board.current_player != self.player:
+            raise ValueError("%s is not the player to move" % self.player)
+
+        evaluator = heuristics.IncrementalEvaluator(board)
+        races = minimax.solves_races(board)
         actions = self._generate_all_actions(board)
 
         # Easy AI: only consider pawn moves
         if self.difficulty == "easy":
-            actions = [a for a in actions if a["type"] == "move"]
+            actions = [a for a in actions if not is_wall_move(a, board.geometry)]
 
         # Set depth based on difficulty
         if self.difficulty == "easy":
@@ -52,14 +59,21 @@ class AIPlayer:
         beta = float('inf')
 
         for action in actions:
-            simulated_board = self._simulate_action(board, action)
-            score = minimax.minimax_alpha_beta_quoridor(
-                simulated_board,
-                depth=depth - 1,
-                is_maximizing=(self.player == "P2"),
-                alpha=alpha,
-                beta=beta
-            )
+            undo = self._simulate_action(board, action)
+            evaluator.push(board, action)
+            try:
+                score = minimax.minimax_alpha_beta_quoridor(
+                    board,
+                    depth=depth - 1,
+                    is_maximizing=(self.player == "P2"),
+                    alpha=alpha,
+                    beta=beta,
+                    evaluator=evaluator,
+                    races=races
+                )
+            finally:
+                board.unmake_move(undo)
+                evaluator.pop()
 
             if self.player == "P1":
                 if score > best_score:
@@ -80,8 +94,11 @@ class AIPlayer:
         best_actions = []
 
         for action in actions:
-            simulated_board = self._simulate_action(board, action)
-            score = heuristics.heuristic(simulated_board)
+            undo = self._simulate_action(board, action)
+            try:
+                score = heuristics.heuristic(board)
+            finally:
+                board.unmake_move(undo)
 
             if score > best_score:
                 best_score = score
@@ -96,48 +113,23 @@ class AIPlayer:
         return self._generate_pawn_moves(board) + self._generate_wall_moves(board)
 
     def _generate_pawn_moves(self, board):
-        moves = []
-        current_pos = board.pawns[self.player]
-        opponent_pos = board.pawns[self.opponent]
-
-        for new_pos in board.get_adjacent_positions(current_pos).values():
-            if board.is_valid_move(self.player, new_pos):
-                moves.append({"type": "move", "to": new_pos})
-
-        return moves
+        # Square codes from the pawn move table, jumps and diagonals included
+        return list(board.pawn_move_squares(self.player))
 
     def _generate_wall_moves(self, board):
         moves = []
         if board.walls_left[self.player] <= 0:
             return moves
 
-        for x in range(board.GRID_SIZE - 1):
-            for y in range(board.GRID_SIZE - 1):
-                for orientation in ("H", "V"):
-                    if board.can_place_wall(x, y, orientation):
-                        moves.append({
-                            "type": "wall",
-                            "x": x,
-                            "y": y,
-                            "orientation": orientation
-                        })
+        num_squares = board.geometry.num_squares
+        for slot in sorted(board.legal_wall_slots()):
+            moves.append(num_squares + slot)
         return moves
 
 
     def _simulate_action(self, board, action):
-        new_board = copy.deepcopy(board)
-
-        if action["type"] == "move":
-            new_board.move_pawn(self.player, action["to"])
-        else:
-            new_board.place_wall(
-                self.player,
-                action["x"],
-                action["y"],
-                action["orientation"]
-            )
-
-        return new_board
+        # Apply the action (a move code) in place; caller reverts it with board.unmake_move
+        return board.make_move(action)
 
 
     # checking that wall does not block paths
@@ -0,0 +1,63 @@
+"""
+Vectorized scoring of the wall-placement children of a search node.
+
+Placing a wall leaves both pawns where they are, so every wall child of a
+node differs from its parent only in its edge masks and the mover's
+walls_left. wall_child_scores stacks those masks into arrays and scores
+all children with one lock-step NumPy search (Core.batch_pathfinding),
+giving exactly heuristic(child) for each.
+"""
+from Core.batch_pathfinding import goal_distances, mask_bits, np, slot_edge_arrays
+from Ai import heuristics
+
+
+def available():
+    return np is not None
+
+
+def _open_sides(square, h_blocked, v_blocked, size):
+    # Open sides of square for every child, as an int array
+    r, c = divmod(square, size)
+    sides = np.zeros(len(h_blocked), dtype=np.int64)
+    if r > 0:
+        sides += ~h_blocked[:, square - size]
+    if r < size - 1:
+        sides += ~h_blocked[:, square]
+    if c > 0:
+        sides += ~v_blocked[:, square - 1]
+    if c < size - 1:
+        sides += ~v_blocked[:, square]
+    return sides
+
+
+def wall_child_scores(board, player, slots):
+    """
+    heuristic score after player places each wall of slots, as a list.
+    The slots must be legal for board.
+    """
+    geometry = board.geometry
+    size = geometry.size
+    slot_h, slot_v = slot_edge_arrays(geometry)
+
+    index = np.asarray(slots, dtype=np.int64)
+    h_blocked = mask_bits(board.h_edges, geometry) | slot_h[index].astype(bool)
+    v_blocked = mask_bits(board.v_edges, geometry) | slot_v[index].astype(bool)
+
+    (r1, c1), (r2, c2) = board.pawns["P1"], board.pawns["P2"]
+    s1 = r1 * size + c1
+    s2 = r2 * size + c2
+    pawn_squares = np.tile(np.array([s1, s2], dtype=np.int64), (len(index), 1))
+
+    distances = goal_distances(pawn_squares, h_blocked, v_blocked, geometry)
+    mobility = (_open_sides(s1, h_blocked, v_blocked, size)
+                - _open_sides(s2, h_blocked, v_blocked, size))
+
+    walls_left = dict(board.walls_left)
+    walls_left[player] -= 1
+
+    # Same terms and order as heuristics.evaluate; weights are read at call
+    # time since heuristics.load_weights may replace them
+    scores = (distances[:, 1] - distances[:, 0]) * heuristics.PATH_WEIGHT
+    scores += mobility * heuristics.MOBILITY_WEIGHT
+    scores += (walls_left["P1"] - walls_left["P2"]) * heuristics.WALL_WEIGHT
+    return scores.tolist()
@@ -1,5 +1,23 @@
 
 import heapq
+import json
+import os
+from Core.geometry import get_geometry
+from Core.pathfinding import distance_cache, wall_set_key
+from Core.pawn_moves import get_pawn_move_table
+
+# Evaluation weights: path length difference, open sides around each pawn,
+# walls left
+PATH_WEIGHT = 10
+MOBILITY_WEIGHT = 0.5
+WALL_WEIGHT = 1.0
+
+# Tuned weights written by tools/tune_weights.py, loaded at import when present
+WEIGHTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weights.json")
+
+# Number of open sides for a 4-bit mask of blocked sides
+_OPEN_SIDES = tuple(4 - bin(mask).count("1") for mask in range(16))
+
 def a_star_heuristic(curr_pos, goal_row):
     """
     Manhattan distance to the target row.
@@ -12,13 +30,29 @@ def a_star_heuristic(curr_pos, goal_row):
 
 
 def shortest_path(board, player):
+    """
+    Shortest path length for a player's pawn to its goal line.
+    """
+
+    # Boards with distance fields answer in O(1); this covers every board
+    # the search runs on, so only other boards use distance_cache
+    if hasattr(board, "goal_distance"):
+        return board.goal_distance(player)
+
+    start = board.pawns[player]
+    key = (wall_set_key(board), start, player)
+    return distance_cache.lookup(key, lambda: a_star_path_length(board, player))
+
+
+def a_star_path_length(board, player):
     """
     A* shortest path for a player's pawn to its goal line.
     Returns length of shortest path.
     """
 
     start = board.pawns[player]
-    goal_row = 8 if player == "P1" else 0  # P1 goes DOWN, P2 goes UP
+    goal_row = board.GRID_SIZE - 1 if player == "P1" else 0  # P1 goes DOWN, P2 goes UP
+    neighbours = get_geometry(board.GRID_SIZE).neighbours
 
     visited = set()
     pq = []  # priority queue
@@ -39,10 +73,8 @@ def shortest_path(board, player):
         if r == goal_row:
             return g_score
 
-        # Expand neighbors
-        for move in board.get_adjacent_positions(pos).values():
-            if not board.inside_board(move):
-                continue
+        # Expand in-board neighbors
+        for move in neighbours[pos]:
             if board.is_wall_blocking(pos, move):
                 continue
                    
@@ -54,33 +86,322 @@ def shortest_path(board, player):
     # No path found (should never happen if walls allow path)
     return float('inf')
 
+class EvalCache:
+    """
+    Fixed-size evaluation cache indexed by the low bits of a 64-bit
+    position hash. Each slot keeps one (key, value) pair and a new entry
+    always replaces the old one.
+    """
+
+    def __init__(self, size_bits=16, keep=True):
+        self.size = 1 << size_bits
+        self.mask = self.size - 1
+        self.keys = [None] * self.size
+        self.values = [0] * self.size
+        # Keep entries between searches; heuristic depends only on the position
+        self.keep = keep
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key):
+        i = key & self.mask
+        if self.keys[i] == key:
+            self.hits += 1
+            return self.values[i]
+        self.misses += 1
+        return None
+
+    def store(self, key, value):
+        i = key & self.mask
+        self.keys[i] = key
+        self.values[i] = value
+
+    def clear(self):
+        self.keys = [None] * self.size
+        self.values = [0] * self.size
+        self.hits = 0
+        self.misses = 0
+
+    def start_search(self):
+        """
+        Called before each move search; drops the entries unless keep is set.
+        """
+        if not self.keep:
+            self.clear()
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# Shared by heuristic for boards with a Zobrist key. Ai.minimax scores its
+# leaves with IncrementalEvaluator and does not use it
+eval_cache = EvalCache()
+
+
+def load_weights(path=WEIGHTS_FILE):
+    """
+    Replace the evaluation weights with those saved in path by
+    save_weights. A missing or malformed file keeps the current weights.
+    Returns True when weights were loaded.
+    """
+    global PATH_WEIGHT, MOBILITY_WEIGHT, WALL_WEIGHT
+    if not os.path.exists(path):
+        return False
+
+    try:
+        with open(path) as f:
+            weights = json.load(f)
+        path_weight = float(weights["path"])
+        mobility_weight = float(weights["mobility"])
+        wall_weight = float(weights["walls"])
+    except (ValueError, KeyError, TypeError):
+        return False
+
+    PATH_WEIGHT = path_weight
+    MOBILITY_WEIGHT = mobility_weight
+    WALL_WEIGHT = wall_weight
+    # Cached scores were computed with the old weights
+    eval_cache.clear()
+    return True
+
+
+def save_weights(path, path_weight, mobility_weight, wall_weight):
+    """
+    Write evaluation weights for load_weights.
+    """
+    weights = {"path": path_weight, "mobility": mobility_weight, "walls": wall_weight}
+    with open(path, "w") as f:
+        json.dump(weights, f, indent=2)
+        f.write("\n")
+
+
+load_weights()
+
+
 def heuristic(board):
     """
     Evaluate board state for AI.
     Higher score = better for P1 (AI if AI is P1).
+    Scores are cached by the board's Zobrist key when it has one.
+    """
+    key = getattr(board, "zobrist_key", None)
+    if key is None:
+        return raw_heuristic(board)
+
+    score = eval_cache.lookup(key)
+    if score is None:
+        score = evaluate(board)
+        eval_cache.store(key, score)
+    return score
+
+
+def raw_heuristic(board):
+    """
+    heuristic without the evaluation cache.
     """
 
     p1_dist = shortest_path(board, "P1")
     p2_dist = shortest_path(board, "P2")
 
     # Basic heuristic: difference in path length
-    score = (p2_dist - p1_dist) * 10
+    score = (p2_dist - p1_dist) * PATH_WEIGHT
 
     # Mobility bonus
     p1_moves = 0
     p2_moves = 0
+    neighbours = get_geometry(board.GRID_SIZE).neighbours
 
-    for m in board.get_adjacent_positions(board.pawns["P1"]).values():
-        if board.inside_board(m) and not board.is_wall_blocking(board.pawns["P1"], m):
+    for m in neighbours[board.pawns["P1"]]:
+        if not board.is_wall_blocking(board.pawns["P1"], m):
             p1_moves += 1
 
-    for m in board.get_adjacent_positions(board.pawns["P2"]).values():
-        if board.inside_board(m) and not board.is_wall_blocking(board.pawns["P2"], m):
+    for m in neighbours[board.pawns["P2"]]:
+        if not board.is_wall_blocking(board.pawns["P2"], m):
             p2_moves += 1
 
-    score += (p1_moves - p2_moves) * 0.5
+    score += (p1_moves - p2_moves) * MOBILITY_WEIGHT
 
     # Wall advantage
-    score += (board.walls_left["P1"] - board.walls_left["P2"]) * 1.0
+    score += (board.walls_left["P1"] - board.walls_left["P2"]) * WALL_WEIGHT
+
+    return score
+
+
+def evaluate(board):
+    """
+    Same score as raw_heuristic in one pass: path lengths come from the
+    board's distance fields and mobility from the edge masks, so no
+    searches or position containers are involved. Boards without distance
+    fields fall back to raw_heuristic.
+    """
+    fields = getattr(board, "distance_fields", None)
+    if fields is None:
+        return raw_heuristic(board)
+
+    size = board.GRID_SIZE
+    (r1, c1), (r2, c2) = board.pawns["P1"], board.pawns["P2"]
+    s1 = r1 * size + c1
+    s2 = r2 * size + c2
+
+    field1, field2 = fields["P1"], fields["P2"]
+    p1_dist = field1.dist[s1]
+    if p1_dist >= field1.unreachable:
+        p1_dist = float('inf')
+    p2_dist = field2.dist[s2]
+    if p2_dist >= field2.unreachable:
+        p2_dist = float('inf')
+
+    local_mask = get_pawn_move_table(board.geometry).local_mask
+    h_edges, v_edges = board.h_edges, board.v_edges
+    mobility = (_OPEN_SIDES[local_mask(s1, h_edges, v_edges)]
+                - _OPEN_SIDES[local_mask(s2, h_edges, v_edges)])
+
+    walls_left = board.walls_left
+
+    # Same terms and order as raw_heuristic so the floats match exactly
+    score = (p2_dist - p1_dist) * PATH_WEIGHT
+    score += mobility * MOBILITY_WEIGHT
+    score += (walls_left["P1"] - walls_left["P2"]) * WALL_WEIGHT
+    return score
+
+
+def evaluation_features(board):
+    """
+    Unweighted (path, mobility, walls) terms of the evaluation, so that
+    heuristic(board) == path * PATH_WEIGHT + mobility * MOBILITY_WEIGHT
+    + walls * WALL_WEIGHT.
+    """
+    size = board.GRID_SIZE
+    (r1, c1), (r2, c2) = board.pawns["P1"], board.pawns["P2"]
+    local_mask = get_pawn_move_table(board.geometry).local_mask
+    h_edges, v_edges = board.h_edges, board.v_edges
+
+    path = shortest_path(board, "P2") - shortest_path(board, "P1")
+    mobility = (_OPEN_SIDES[local_mask(r1 * size + c1, h_edges, v_edges)]
+                - _OPEN_SIDES[local_mask(r2 * size + c2, h_edges, v_edges)])
+    walls = board.walls_left["P1"] - board.walls_left["P2"]
+    return path, mobility, walls
+
+
+def _distance_bounds(board, player):
+    # (lower, upper) bound on the player's path length without searching
+    if hasattr(board, "goal_distance"):
+        d = board.goal_distance(player)
+        return d, d
+
+    start = board.pawns[player]
+    d = distance_cache.peek((wall_set_key(board), start, player))
+    if d is not None:
+        return d, d
+
+    goal_row = board.GRID_SIZE - 1 if player == "P1" else 0
+    return a_star_heuristic(start, goal_row), board.GRID_SIZE * board.GRID_SIZE - 1
+
+
+def score_bounds(board):
+    """
+    Cheap (lower, upper) bounds on heuristic(board) from Manhattan or
+    cached distances, the walls_left difference and the mobility range.
+    Valid for weights of either sign, such as tuned ones.
+    """
+    low1, high1 = _distance_bounds(board, "P1")
+    low2, high2 = _distance_bounds(board, "P2")
+    walls = (board.walls_left["P1"] - board.walls_left["P2"]) * WALL_WEIGHT
+    path = sorted(((low2 - high1) * PATH_WEIGHT, (high2 - low1) * PATH_WEIGHT))
+    mobility = 4 * abs(MOBILITY_WEIGHT)
+    return (path[0] - mobility + walls,
+            path[1] + mobility + walls)
+
+
+def lazy_heuristic(board, alpha, beta):
+    """
+    Leaf evaluation for alpha-beta. Returns heuristic(board) when it can
+    fall inside (alpha, beta); otherwise a bound on the wrong side of the
+    window, which refutes the leaf just as well without the full evaluation.
+    Ai.minimax does not call it: its leaves come from IncrementalEvaluator,
+    which is cheaper than the bounds on a Board with distance fields.
+    """
+    key = getattr(board, "zobrist_key", None)
+    if key is not None:
+        score = eval_cache.lookup(key)
+        if score is not None:
+            return score
+
+    low, high = score_bounds(board)
+    if high <= alpha:
+        return high
+    if low >= beta:
+        return low
+
+    score = evaluate(board)
+    if key is not None:
+        eval_cache.store(key, score)
+    return score
+
+
+class IncrementalEvaluator:
+    """
+    evaluate() kept up to date along a search line. Each node on the line
+    holds both players' path lengths and open sides. A pawn move leaves
+    the walls and both distance fields as they were, so the child's state
+    is the parent's with the mover's entries looked up again; after a wall
+    placement the state is recomputed from the board, and only when a
+    score or a pawn-move child asks for it.
+
+    board must have distance fields (Core.board.Board) and be the board
+    that is searched. Call push after board.make_move and pop after
+    board.unmake_move.
+    """
+
+    def __init__(self, board):
+        self.fields = board.distance_fields
+        self.local_mask = get_pawn_move_table(board.geometry).local_mask
+        self.num_squares = board.geometry.num_squares
+        self.stack = [None]
+
+    def _side(self, player, square, board):
+        # (path length, open sides) of a pawn on square
+        field = self.fields[player]
+        d = field.dist[square]
+        if d >= field.unreachable:
+            d = float('inf')
+        return d, _OPEN_SIDES[self.local_mask(square, board.h_edges, board.v_edges)]
+
+    def _state(self, board):
+        state = self.stack[-1]
+        if state is None:
+            size = board.GRID_SIZE
+            (r1, c1), (r2, c2) = board.pawns["P1"], board.pawns["P2"]
+            state = self.stack[-1] = (self._side("P1", r1 * size + c1, board)
+                                      + self._side("P2", r2 * size + c2, board))
+        return state
+
+    def push(self, board, move):
+        """
+        Record the move (an integer move code) just made on board.
+        """
+        parent = self.stack[-1]
+        if parent is None or not isinstance(move, int) or move >= self.num_squares:
+            # Walls change the fields: recompute lazily
+            self.stack.append(None)
+        elif board.current_player == "P2":
+            self.stack.append(self._side("P1", move, board) + parent[2:])
+        else:
+            self.stack.append(parent[:2] + self._side("P2", move, board))
+
+    def pop(self):
+        self.stack.pop()
+
+    def score(self, board):
+        """
+        evaluate(board) for the current node.
+        """
+        p1_dist, p1_open, p2_dist, p2_open = self._state(board)
+        walls_left = board.walls_left
 
-    return score
\ No newline at end of file
+        # Same terms and order as evaluate so the floats match exactly
+        score = (p2_dist - p1_dist) * PATH_WEIGHT
+        score += (p1_open - p2_open) * MOBILITY_WEIGHT
+        score += (walls_left["P1"] - walls_left["P2"]) * WALL_WEIGHT
+        return score
@@ -1,50 +1,106 @@
-from Ai.heuristics import heuristic
+from Ai import batch_eval
+from Ai.heuristics import IncrementalEvaluator
+from Ai.race_solver import race_score
+from Core.moves import decode_move
+
+# Optional perfect-play oracle for small boards, see Ai.tablebase.load_tablebase
+tablebase = None
+
+# Score the wall children of depth-1 nodes in one NumPy call (Ai.batch_eval)
+# instead of one leaf at a time. Ignored when NumPy is not installed
+BATCH_LEAVES = True
+
 #=====================================================
 # Minimax algorithm
 #======================================================
-def is_game_over(board):
+def winner(board):
     """
-    Check if the game is over.
-    P1 wins if reaches column 8
-    P2 wins if reaches column 0
+    Return the player standing on their goal row, or None.
+    P1 wins on the last row, P2 on row 0
     """
-    # P1 reached last column (column 8)
-    if board.pawns["P1"][1] == 8:
-        return True
+    if board.pawns["P1"][0] == board.GRID_SIZE - 1:
+        return "P1"
+    if board.pawns["P2"][0] == 0:
+        return "P2"
+    return None
 
-    # P2 reached first column (column 0)
-    if board.pawns["P2"][1] == 0:
-        return True
 
-    return False
+def is_game_over(board):
+    """
+    Check if the game is over.
+    """
+    return winner(board) is not None
 
 
 def check_winner(board):
     """
     Separate function to check winner (returns string)
     """
-    if board.pawns["P1"][1] == 8:
-        return "P1 is winner"
-    elif board.pawns["P2"][1] == 0:
-        return "P2 is winner"
-    else:
+    player = winner(board)
+    if player is None:
         return "Game not over"
+    return player + " is winner"
+
+
+def solves_races(board):
+    """
+    True when a search from board should score its nodes with race_score:
+    no walls are left at the root, so every node shares one wall layout and
+    the search builds at most one race table. Deciding per node would build
+    a table for every last-wall child instead.
+    """
+    return not board.walls_left["P1"] and not board.walls_left["P2"]
+
+
+def _make_move(board, move, evaluator):
+    undo = board.make_move(move)
+    evaluator.push(board, move)
+    return undo
+
 
+def _unmake_move(board, undo, evaluator):
+    board.unmake_move(undo)
+    evaluator.pop()
 
-def minimax_alpha_beta_quoridor(board, depth, is_maximizing,alpha,beta):
+
+def minimax_alpha_beta_quoridor(board, depth, is_maximizing,alpha,beta, evaluator=None, races=False):
     """
-    Minimax algorithm for Quoridor
+    Minimax algorithm for Quoridor.
+    Leaves are scored by an IncrementalEvaluator kept along the search
+    line; pass the one made at the root, or None to start one from board.
+    With races (see solves_races) wall-free races are scored exactly.
     """
+    if evaluator is None:
+        evaluator = IncrementalEvaluator(board)
+
     # Base case - game is over
-    if is_game_over(board):
-        if board.pawns["P1"][1] == 8:
-            return 10000
-        elif board.pawns["P2"][1] == 0:
-            return -10000
+    won = winner(board)
+    if won == "P1":
+        return 10000
+    elif won == "P2":
+        return -10000
+
+    # Positions solved ahead of time
+    if tablebase is not None:
+        proven = tablebase.score(board)
+        if proven is not None:
+            return proven
+
+    # No walls left: the race is solved exactly
+    if races:
+        proven = race_score(board)
+        if proven is not None:
+            return proven
 
     # Base case - depth limit reached
     if depth == 0:
-        return heuristic(board)
+        return evaluator.score(board)
+
+    # Last ply before the leaves: batch the wall placements
+    # unless the tablebase could prove one of the children
+    if depth == 1 and BATCH_LEAVES and batch_eval.available() \
+            and (tablebase is None or not tablebase.covers_children(board)):
+        return _search_frontier(board, is_maximizing, alpha, beta, evaluator, races)
 
     # Maximizer (P1's turn)
     if is_maximizing:
@@ -52,9 +108,9 @@ def minimax_alpha_beta_quoridor(board, depth, is_maximizing,alpha,beta):
         moves = get_possible_moves(board, "P1")
 
         for move in moves:
-            new_board = board.copy()
-            apply_move(new_board, move, "P1")
-            value = minimax_alpha_beta_quoridor(new_board, depth - 1, False,alpha,beta)
+            undo = _make_move(board, move, evaluator)
+            value = minimax_alpha_beta_quoridor(board, depth - 1, False,alpha,beta, evaluator, races)
+            _unmake_move(board, undo, evaluator)
             max_value = max(max_value, value)
 
             alpha =max(alpha, value)
@@ -69,9 +125,9 @@ def minimax_alpha_beta_quoridor(board, depth, is_maximizing,alpha,beta):
         moves = get_possible_moves(board, "P2")
 
         for move in moves:
-            new_board = board.copy()
-            apply_move(new_board, move, "P2")
-            value = minimax_alpha_beta_quoridor(new_board, depth - 1, True,alpha,beta)
+            undo = _make_move(board, move, evaluator)
+            value = minimax_alpha_beta_quoridor(board, depth - 1, True,alpha,beta, evaluator, races)
+            _unmake_move(board, undo, evaluator)
             min_value = min(min_value, value)
             beta = min(beta,value)
             if beta<=alpha:
@@ -80,35 +136,72 @@ def minimax_alpha_beta_quoridor(board, depth, is_maximizing,alpha,beta):
         return min_value
 
 
-def get_possible_moves(board, player):
+def _search_frontier(board, is_maximizing, alpha, beta, evaluator, races):
     """
-    Returns list of all possible moves for a player
+    Depth-1 search that scores all wall children with one call to
+    batch_eval.wall_child_scores. Pawn moves are searched as usual first,
+    in the same move order and with the same cutoffs as the plain search.
     """
-    moves = []
+    player = "P1" if is_maximizing else "P2"
+    num_squares = board.geometry.num_squares
+    best = float('-inf') if is_maximizing else float('inf')
+
+    moves = get_possible_moves(board, player)
+    slots = [move - num_squares for move in moves if move >= num_squares]
+
+    for move in moves:
+        if slots and move >= num_squares:
+            break
+        undo = _make_move(board, move, evaluator)
+        value = minimax_alpha_beta_quoridor(board, 0, not is_maximizing, alpha, beta, evaluator, races)
+        _unmake_move(board, undo, evaluator)
+        if is_maximizing:
+            best = max(best, value)
+            alpha = max(alpha, value)
+        else:
+            best = min(best, value)
+            beta = min(beta, value)
+        if beta <= alpha:
+            return best
+
+    if slots:
+        for value in batch_eval.wall_child_scores(board, player, slots):
+            if is_maximizing:
+                best = max(best, value)
+                alpha = max(alpha, value)
+            else:
+                best = min(best, value)
+                beta = min(beta, value)
+            if beta <= alpha:
+                break
 
-    # 1. Pawn moves
-    current_pos = board.pawns[player]
-    for direction, new_pos in board.get_adjacent_positions(current_pos).items():
-        if board.is_valid_move(player, new_pos):
-            moves.append(('move', new_pos))
+    return best
 
-    # 2. Wall placements
-    if board.walls_left[player] > 0:
-        for x in range(board.GRID_SIZE - 1):
-            for y in range(board.GRID_SIZE - 1):
-                if board.can_place_wall(x, y, 'H'):
-                    moves.append(('wall', x, y, 'H'))
 
-                if board.can_place_wall(x, y, 'V'):
-                    moves.append(('wall', x, y, 'V'))
+def get_possible_moves(board, player):
+    """
+    Returns list of all possible moves for a player, as integer move codes
+    (see Core.moves)
+    """
+    # 1. Pawn moves (square codes), including jumps and diagonals
+    moves = list(board.pawn_move_squares(player))
+
+    # 2. Wall placements (slot order matches x, y, 'H' before 'V')
+    if board.walls_left[player] > 0:
+        num_squares = board.geometry.num_squares
+        for slot in sorted(board.legal_wall_slots()):
+            moves.append(num_squares + slot)
 
     return moves
 
 
 def apply_move(board, move, player):
     """
-    Apply a move to the board
+    Apply a move (move code or tuple) to the board
     """
+    if isinstance(move, int):
+        move = decode_move(move, board.geometry)
+
     if move[0] == 'move':
         _, new_pos = move
         board.move_pawn(player, new_pos)
@@ -124,7 +217,7 @@ def get_best_move(board, player, difficulty="medium"):
 
     Args:
         board: current Board state
-        player: "P1" or "P2"
+        player: "P1" or "P2", the player to move
         difficulty: "easy", "medium", "hard", "expert"
 
     Returns:
@@ -143,6 +236,13 @@ def get_best_move(board, player, difficulty="medium"):
     else:
         depth = 3  # Default to medium
 
+    # The search applies moves for board.current_player
+    if board.current_player != player:
+        raise ValueError("%s is not the player to move" % player)
+
+    evaluator = IncrementalEvaluator(board)
+    races = solves_races(board)
+
     # Determine if maximizing or minimizing
     is_maximizing = (player == "P1")
 
@@ -163,12 +263,14 @@ def get_best_move(board, player, difficulty="medium"):
 
     # Try each move
     for move in possible_moves:
-        # Copy board and apply move
-        new_board = board.copy()
-        apply_move(new_board, move, player)
-
-        # Evaluate this move using minimax
-        value = minimax_alpha_beta_quoridor(new_board, depth - 1, not is_maximizing,alpha,beta)
+        # Apply move in place
+        undo = _make_move(board, move, evaluator)
+
+        # Evaluate this move using minimax, then restore the board
+        try:
+            value = minimax_alpha_beta_quoridor(board, depth - 1, not is_maximizing,alpha,beta, evaluator, races)
+        finally:
+            _unmake_move(board, undo, evaluator)
 
         # Update best move if better
         if is_maximizing:
@@ -0,0 +1,173 @@
+"""
+Exact solver for pawn races.
+
+Once neither player has walls left the walls are fixed and a position is
+just (P1 square, P2 square, side to move). For each wall configuration the
+solver runs one retrograde analysis over all of those states, using the
+full pawn move rules (jumps, diagonal sidesteps, pawns blocking each
+other), and records who wins with best play and in how many plies.
+Tables are memoized per wall configuration. Building one takes tens of
+milliseconds, so Ai.minimax only consults the solver in searches that
+start with no walls left (see minimax.solves_races).
+"""
+from array import array
+from collections import deque
+
+from Core.geometry import get_geometry
+from Core.pawn_moves import get_pawn_move_table
+
+# Outcome for the side to move
+UNKNOWN = 0
+WIN = 1
+LOSS = 2
+
+# Same magnitude as the terminal scores in Ai.minimax
+WIN_SCORE = 10000
+
+# Wall configurations kept in the memo
+MAX_TABLES = 64
+
+
+class RaceTable:
+    """
+    Outcomes and distances for every pawn state of one wall configuration.
+    States that stay UNKNOWN are draws: neither side can force a win.
+    """
+
+    def __init__(self, geometry, h_edges, v_edges):
+        self.num_squares = geometry.num_squares
+        self.outcome, self.plies = _solve(geometry, h_edges, v_edges)
+
+    def lookup(self, p1_square, p2_square, side):
+        """
+        (outcome for the side to move, plies to the end), side 0 is P1.
+        """
+        s = (p1_square * self.num_squares + p2_square) * 2 + side
+        return self.outcome[s], self.plies[s]
+
+
+def _solve(geometry, h_edges, v_edges):
+    size = geometry.size
+    n = geometry.num_squares
+    last_row = n - size
+    moves = get_pawn_move_table(geometry).moves
+
+    num_states = n * n * 2
+    outcome = bytearray(num_states)
+    plies = array("H", bytes(2 * num_states))
+    remaining = array("H", bytes(2 * num_states))
+    predecessors = [None] * num_states
+    queue = deque()
+
+    for p1 in range(n):
+        for p2 in range(n):
+            if p1 == p2:
+                continue
+            base = (p1 * n + p2) * 2
+            p1_home = p1 >= last_row
+            p2_home = p2 < size
+            if p1_home or p2_home:
+                # Game over: whoever stands on their goal row has won
+                outcome[base] = WIN if p1_home and not p2_home else LOSS
+                outcome[base + 1] = WIN if p2_home and not p1_home else LOSS
+                queue.append(base)
+                queue.append(base + 1)
+                continue
+
+            # P1 to move
+            targets = moves(p1, p2, h_edges, v_edges)
+            remaining[base] = len(targets)
+            for t in targets:
+                child = (t * n + p2) * 2 + 1
+                if predecessors[child] is None:
+                    predecessors[child] = []
+                predecessors[child].append(base)
+
+            # P2 to move
+            targets = moves(p2, p1, h_edges, v_edges)
+            remaining[base + 1] = len(targets)
+            for t in targets:
+                child = (p1 * n + t) * 2
+                if predecessors[child] is None:
+                    predecessors[child] = []
+                predecessors[child].append(base + 1)
+
+    # Retrograde pass in order of distance: a state is won once one move
+    # reaches a lost state, and lost once every move reaches a won state
+    while queue:
+        s = queue.popleft()
+        parents = predecessors[s]
+        if parents is None:
+            continue
+        lost = outcome[s] == LOSS
+        d = plies[s] + 1
+        for parent in parents:
+            if outcome[parent]:
+                continue
+            if lost:
+                outcome[parent] = WIN
+                plies[parent] = d
+                queue.append(parent)
+            else:
+                remaining[parent] -= 1
+                if not remaining[parent]:
+                    outcome[parent] = LOSS
+                    plies[parent] = d
+                    queue.append(parent)
+
+    return outcome, plies
+
+
+_tables = {}
+
+
+def get_race_table(geometry, h_edges, v_edges):
+    """
+    Return the memoized RaceTable for a wall configuration.
+    """
+    key = (geometry.size, h_edges, v_edges)
+    table = _tables.get(key)
+    if table is None:
+        if len(_tables) >= MAX_TABLES:
+            # Drop the oldest configuration
+            del _tables[next(iter(_tables))]
+        table = _tables[key] = RaceTable(geometry, h_edges, v_edges)
+    return table
+
+
+def solve_race(board):
+    """
+    Exact result of a wall-free race from board, ignoring walls_left:
+    (winner, plies) with winner "P1" or "P2", or None if neither side can
+    force a win.
+    """
+    geometry = get_geometry(board.GRID_SIZE)
+    size = geometry.size
+    (r1, c1), (r2, c2) = board.pawns["P1"], board.pawns["P2"]
+    side = 0 if board.current_player == "P1" else 1
+
+    table = get_race_table(geometry, board.h_edges, board.v_edges)
+    outcome, plies = table.lookup(r1 * size + c1, r2 * size + c2, side)
+    if outcome == UNKNOWN:
+        return None
+
+    mover = board.current_player
+    other = "P2" if mover == "P1" else "P1"
+    return (mover if outcome == WIN else other), plies
+
+
+def race_score(board):
+    """
+    Proven minimax score (P1 positive) when no walls remain, else None.
+    Faster wins score higher.
+    """
+    if board.walls_left["P1"] or board.walls_left["P2"]:
+        return None
+
+    result = solve_race(board)
+    if result is None:
+        return None
+
+    winner, plies = result
+    score = WIN_SCORE - plies
+    return score if winner == "P1" else -score
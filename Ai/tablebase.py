@@ -0,0 +1,117 @@
+"""
+Perfect-play tablebase for small board variants.
+
+A tablebase file (built by tools/build_tablebase.py) holds every position
+reachable from the start of a grid_size board with max_walls walls each,
+solved by retrograde analysis. The layout is:
+
+    header  magic b"QTB1", grid_size, max_walls, record size, entry count
+    entries Core.codec record, outcome byte, plies (uint16), sorted by record
+
+Outcome is for the side to move (see Ai.race_solver: WIN, LOSS, or
+UNKNOWN for draws). The file is memory-mapped and probed by binary search,
+so opening it costs nothing and lookups touch a few pages.
+"""
+import mmap
+import struct
+
+from Core.codec import encode_position, record_size
+from Ai.race_solver import UNKNOWN, WIN, WIN_SCORE
+
+MAGIC = b"QTB1"
+_HEADER = struct.Struct("<4sBBBI")
+_VALUE = struct.Struct("<BH")
+
+
+def write_tablebase(path, grid_size, max_walls, entries):
+    """
+    Write (record, outcome, plies) entries to path, sorted by record.
+    """
+    entries = sorted(entries)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, grid_size, max_walls, record_size(grid_size), len(entries)))
+        for record, outcome, plies in entries:
+            f.write(record)
+            f.write(_VALUE.pack(outcome, plies))
+
+
+class Tablebase:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.grid_size, self.max_walls, self.record_size, self.count = \
+            _HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError("%s is not a tablebase file" % path)
+        self.entry_size = self.record_size + _VALUE.size
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self.data.close()
+
+    def covers(self, board):
+        return (board.GRID_SIZE == self.grid_size
+                and board.walls_left["P1"] <= self.max_walls
+                and board.walls_left["P2"] <= self.max_walls)
+
+    def covers_children(self, board):
+        """
+        True if the table may cover a position one move after board. A wall
+        placement leaves the mover one wall short of board.
+        """
+        mover = board.current_player
+        other = "P2" if mover == "P1" else "P1"
+        return (board.GRID_SIZE == self.grid_size
+                and board.walls_left[mover] - 1 <= self.max_walls
+                and board.walls_left[other] <= self.max_walls)
+
+    def probe(self, board):
+        """
+        (outcome for the side to move, plies to the end), or None if the
+        position is not in the table.
+        """
+        if not self.covers(board):
+            return None
+
+        key = encode_position(board)
+        data = self.data
+        size = self.entry_size
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = _HEADER.size + mid * size
+            record = data[start:start + self.record_size]
+            if record < key:
+                lo = mid + 1
+            elif record > key:
+                hi = mid
+            else:
+                return _VALUE.unpack_from(data, start + self.record_size)
+        return None
+
+    def score(self, board):
+        """
+        Proven minimax score (P1 positive), or None for draws and
+        positions outside the table.
+        """
+        result = self.probe(board)
+        if result is None or result[0] == UNKNOWN:
+            return None
+
+        outcome, plies = result
+        mover_wins = outcome == WIN
+        p1_wins = mover_wins == (board.current_player == "P1")
+        score = WIN_SCORE - plies
+        return score if p1_wins else -score
+
+
+def load_tablebase(path):
+    """
+    Open a tablebase and let Ai.minimax probe it during search.
+    """
+    from Ai import minimax
+    minimax.tablebase = Tablebase(path)
+    return minimax.tablebase
@@ -0,0 +1,172 @@
+"""
+Goal distances for many boards at once with NumPy.
+
+Boards are given as arrays:
+
+    pawn_squares  (N, 2) ints, P1 and P2 squares r * size + c
+    h_blocked     (N, size * size) bools, square s to s + size is blocked
+    v_blocked     (N, size * size) bools, square s to s + 1 is blocked
+
+which is the Core.bitboard edge layout with one bool per bit. Distances
+follow Ai.heuristics.shortest_path: orthogonal steps through the walls,
+pawns ignored, float('inf') when the goal row cannot be reached.
+"""
+from Core.geometry import GEOMETRY, get_geometry
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed when this module is used
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is required for batched pathfinding")
+
+
+def _mask_bits(value, num_squares):
+    # Integer bit mask -> bool array, bit s at index s
+    data = value.to_bytes((num_squares + 7) // 8, "little")
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder="little")
+    return bits[:num_squares].astype(bool)
+
+
+def mask_bits(value, geometry=GEOMETRY):
+    """
+    Bool array of the squares set in an edge mask such as Board.h_edges.
+    """
+    _require_numpy()
+    return _mask_bits(value, geometry.num_squares)
+
+
+_slot_edges = {}
+
+
+def slot_edge_arrays(geometry=GEOMETRY):
+    """
+    (h_edges, v_edges) uint8 arrays with one row per wall slot marking the
+    edges it blocks. Built once per board size.
+    """
+    _require_numpy()
+    arrays = _slot_edges.get(geometry.size)
+    if arrays is None:
+        num_slots = len(geometry.wall_slots)
+        h_edges = np.zeros((num_slots, geometry.num_squares), dtype=np.uint8)
+        v_edges = np.zeros((num_slots, geometry.num_squares), dtype=np.uint8)
+        for slot, (h_bits, v_bits) in enumerate(geometry.wall_edge_bits):
+            h_edges[slot] = _mask_bits(h_bits, geometry.num_squares)
+            v_edges[slot] = _mask_bits(v_bits, geometry.num_squares)
+        arrays = _slot_edges[geometry.size] = (h_edges, v_edges)
+    return arrays
+
+
+def boards_geometry(boards):
+    """
+    Core.geometry tables of the boards' size, 9x9 for no boards.
+    Raises ValueError if the boards differ in size.
+    """
+    sizes = {board.GRID_SIZE for board in boards}
+    if len(sizes) > 1:
+        raise ValueError("boards of different sizes: %s" % sorted(sizes))
+    return get_geometry(sizes.pop()) if sizes else GEOMETRY
+
+
+def encode_boards(boards, geometry=None):
+    """
+    Build (pawn_squares, h_blocked, v_blocked) arrays from Board, BitBoard
+    or FrozenBoard objects of one size. geometry defaults to the boards'.
+    """
+    _require_numpy()
+    boards = list(boards)
+    if geometry is None:
+        geometry = boards_geometry(boards)
+    size = geometry.size
+    num_squares = geometry.num_squares
+
+    pawn_squares = np.empty((len(boards), 2), dtype=np.int64)
+    h_blocked = np.zeros((len(boards), num_squares), dtype=bool)
+    v_blocked = np.zeros((len(boards), num_squares), dtype=bool)
+
+    for i, board in enumerate(boards):
+        for j, player in enumerate(("P1", "P2")):
+            r, c = board.pawns[player]
+            pawn_squares[i, j] = r * size + c
+        h_blocked[i] = _mask_bits(board.h_edges, num_squares)
+        v_blocked[i] = _mask_bits(board.v_edges, num_squares)
+
+    return pawn_squares, h_blocked, v_blocked
+
+
+def decode_position_array(array, geometry=GEOMETRY):
+    """
+    Build (pawn_squares, h_blocked, v_blocked) arrays from a
+    Core.codec.POSITION_DTYPE array without decoding records one by one.
+    """
+    _require_numpy()
+    num_slots = len(geometry.wall_slots)
+    h_edges, v_edges = slot_edge_arrays(geometry)
+
+    walls = np.unpackbits(array["walls"], axis=1, bitorder="little")[:, :num_slots]
+    h_blocked = (walls @ h_edges) > 0
+    v_blocked = (walls @ v_edges) > 0
+
+    return array["pawns"].astype(np.int64), h_blocked, v_blocked
+
+
+def goal_distances(pawn_squares, h_blocked, v_blocked, geometry=GEOMETRY):
+    """
+    Shortest path lengths to the goal rows for every board, as an (N, 2)
+    float array of (P1, P2) distances with inf for walled-off pawns.
+
+    All 2N searches expand their frontiers in lock step, one BFS layer per
+    iteration, until each has reached its goal row or run out of squares.
+    """
+    _require_numpy()
+    size = geometry.size
+    n = len(pawn_squares)
+
+    # Stack P1 searches on top of P2 searches
+    starts = np.concatenate([pawn_squares[:, 0], pawn_squares[:, 1]])
+    open_down = ~np.concatenate([h_blocked, h_blocked]).reshape(2 * n, size, size)
+    open_right = ~np.concatenate([v_blocked, v_blocked]).reshape(2 * n, size, size)
+    goal_rows = np.concatenate([np.full(n, size - 1), np.zeros(n, dtype=np.int64)])
+
+    frontier = np.zeros((2 * n, size, size), dtype=bool)
+    frontier[np.arange(2 * n), starts // size, starts % size] = True
+    visited = frontier.copy()
+
+    distances = np.full(2 * n, np.inf)
+    active = np.ones(2 * n, dtype=bool)
+    steps = 0
+
+    while True:
+        # Searches whose frontier touches the goal row are done
+        reached = active & frontier[np.arange(2 * n), goal_rows].any(axis=1)
+        distances[reached] = steps
+        active &= ~reached
+        active &= frontier.reshape(2 * n, -1).any(axis=1)
+        if not active.any():
+            break
+
+        frontier &= active[:, None, None]
+        grown = np.zeros_like(frontier)
+        grown[:, 1:, :] |= frontier[:, :-1, :] & open_down[:, :-1, :]
+        grown[:, :-1, :] |= frontier[:, 1:, :] & open_down[:, :-1, :]
+        grown[:, :, 1:] |= frontier[:, :, :-1] & open_right[:, :, :-1]
+        grown[:, :, :-1] |= frontier[:, :, 1:] & open_right[:, :, :-1]
+
+        frontier = grown & ~visited
+        visited |= frontier
+        steps += 1
+
+    return np.stack([distances[:n], distances[n:]], axis=1)
+
+
+def board_goal_distances(boards, geometry=None):
+    """
+    goal_distances for a list of board objects of one size.
+    """
+    boards = list(boards)
+    if geometry is None:
+        geometry = boards_geometry(boards)
+    return goal_distances(*encode_boards(boards, geometry), geometry=geometry)
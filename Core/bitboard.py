@@ -0,0 +1,289 @@
+from collections import deque
+from collections.abc import MutableMapping
+from Core.geometry import GEOMETRY, get_geometry
+from Core.pawn_moves import get_pawn_move_table
+
+# Bitboard layout
+# ---------------
+# Squares are numbered row by row: square = r * GRID_SIZE + c.
+# h_edges: bit s set -> edge between square s and the square below it is blocked
+# v_edges: bit s set -> edge between square s and the square to its right is blocked
+# wall_mask: one bit per wall slot, slot = (x * (GRID_SIZE - 1) + y) * 2 + (0 for "H", 1 for "V")
+# GRID_SIZE is the board side, 9 unless the board says otherwise
+
+GRID_SIZE = GEOMETRY.size
+ANCHORS = GEOMETRY.anchors
+NUM_WALL_SLOTS = len(GEOMETRY.wall_slots)
+
+# Every helper takes the Core.geometry tables of the board size, 9x9 by default
+
+
+def square_of(pos, geometry=GEOMETRY):
+    r, c = pos
+    return r * geometry.size + c
+
+
+def position_of(square, geometry=GEOMETRY):
+    return divmod(square, geometry.size)
+
+
+def wall_slot(x, y, orientation, geometry=GEOMETRY):
+    return (x * geometry.anchors + y) * 2 + (0 if orientation == "H" else 1)
+
+
+def edge_blocked(h_edges, v_edges, a, b, geometry=GEOMETRY):
+    """
+    Return True if the edge between adjacent squares a and b is blocked.
+    """
+    if a > b:
+        a, b = b, a
+    if b - a == geometry.size:
+        return (h_edges >> a) & 1 == 1
+    return (v_edges >> a) & 1 == 1
+
+
+def reaches_row(start, goal_row, h_edges, v_edges, geometry=GEOMETRY):
+    """
+    BFS over square indices; True if start can reach any square of goal_row.
+    """
+    lo = goal_row * geometry.size
+    hi = lo + geometry.size
+    if lo <= start < hi:
+        return True
+
+    links = geometry.square_links
+    visited = 1 << start
+    queue = deque([start])
+    while queue:
+        s = queue.popleft()
+        for n, _ in links[s]:
+            if (visited >> n) & 1 or edge_blocked(h_edges, v_edges, s, n, geometry):
+                continue
+            if lo <= n < hi:
+                return True
+            visited |= 1 << n
+            queue.append(n)
+    return False
+
+
+def flood_reaches_row(start, goal_row, h_edges, v_edges, geometry=GEOMETRY):
+    """
+    Bit-parallel flood fill; True if start can reach any square of goal_row.
+    The reached set is one integer, grown in all four directions per step.
+    """
+    size = geometry.size
+    goal = geometry.row_masks[goal_row]
+    # Bit s set -> the step from s down (or right) is open
+    open_down = (geometry.full_mask >> size) & ~h_edges
+    open_right = geometry.not_last_column & ~v_edges
+
+    reached = 1 << start
+    while not reached & goal:
+        grown = (reached
+                 | (reached & open_down) << size
+                 | (reached >> size) & open_down
+                 | (reached & open_right) << 1
+                 | (reached >> 1) & open_right)
+        if grown == reached:
+            return False
+        reached = grown
+    return True
+
+
+def pawn_move_allowed(current, opponent, target, h_edges, v_edges, geometry=GEOMETRY):
+    """
+    Board.is_valid_move rules on square indices; target must be on the board.
+    """
+    return target in get_pawn_move_table(geometry).moves(current, opponent, h_edges, v_edges)
+
+
+def wall_allowed(slot, wall_mask, h_edges, v_edges, p1_square, p2_square, geometry=GEOMETRY):
+    """
+    Board.can_place_wall rules for a valid slot index.
+    """
+    # Duplicate, overlap and crossing in one mask test
+    if wall_mask & geometry.wall_conflict_masks[slot]:
+        return False
+
+    h_bits, v_bits = geometry.wall_edge_bits[slot]
+    h_edges |= h_bits
+    v_edges |= v_bits
+
+    return (flood_reaches_row(p1_square, geometry.size - 1, h_edges, v_edges, geometry)
+            and flood_reaches_row(p2_square, 0, h_edges, v_edges, geometry))
+
+
+class _PawnPositions(MutableMapping):
+    """
+    (r, c) view of BitBoard.squares; assigning a position updates the square.
+    """
+
+    def __init__(self, squares, geometry):
+        self._squares = squares
+        self._geometry = geometry
+
+    def __getitem__(self, player):
+        return position_of(self._squares[player], self._geometry)
+
+    def __setitem__(self, player, pos):
+        self._squares[player] = square_of(pos, self._geometry)
+
+    def __delitem__(self, player):
+        del self._squares[player]
+
+    def __iter__(self):
+        return iter(self._squares)
+
+    def __len__(self):
+        return len(self._squares)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class BitBoard:
+    """
+    Board engine that keeps pawn squares and blocked edges as plain integers.
+    Exposes the same API as Core.board.Board.
+    """
+    GRID_SIZE = GRID_SIZE
+    MAX_WALLS = 10
+
+    def __init__(self, ai_opponent=False, grid_size=None):
+        self.ai_opponent = ai_opponent
+
+        if grid_size is not None:
+            self.GRID_SIZE = grid_size
+        self.geometry = get_geometry(self.GRID_SIZE)
+
+        middle = self.GRID_SIZE // 2
+        self.squares = {
+            "P1": square_of((0, middle), self.geometry),
+            "P2": square_of((self.GRID_SIZE - 1, middle), self.geometry)
+        }
+
+        self.h_edges = 0
+        self.v_edges = 0
+        self.wall_mask = 0
+
+        # Kept for callers that iterate the placed walls (GUI, debugging)
+        self.walls = []
+
+        self.walls_left = {
+            "P1": self.MAX_WALLS,
+            "P2": self.MAX_WALLS
+        }
+
+        self.current_player = "P1"
+
+    @classmethod
+    def from_board(cls, board):
+        """
+        Build a BitBoard holding the same position as a Core.board.Board.
+        """
+        bb = cls(board.ai_opponent, board.GRID_SIZE)
+        bb.squares = {p: square_of(pos, bb.geometry) for p, pos in board.pawns.items()}
+        for x, y, o in board.walls:
+            bb._add_wall(x, y, o)
+        bb.walls_left = dict(board.walls_left)
+        bb.current_player = board.current_player
+        return bb
+
+    @property
+    def pawns(self):
+        return _PawnPositions(self.squares, self.geometry)
+
+    @pawns.setter
+    def pawns(self, pawns):
+        self.squares = {p: square_of(pos, self.geometry) for p, pos in pawns.items()}
+
+    def inside_board(self, pos):
+        r, c = pos
+        return 0 <= r < self.GRID_SIZE and 0 <= c < self.GRID_SIZE
+
+    def is_adjacent(self, a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+
+    def get_adjacent_positions(self, pos):
+        adjacent = self.geometry.adjacent.get(pos)
+        if adjacent is not None:
+            return adjacent
+        r, c = pos
+        return {
+            "up": (r - 1, c),
+            "down": (r + 1, c),
+            "left": (r, c - 1),
+            "right": (r, c + 1)
+        }
+
+    def is_wall_blocking(self, pos, new_pos):
+        return edge_blocked(self.h_edges, self.v_edges, square_of(pos, self.geometry),
+                            square_of(new_pos, self.geometry), self.geometry)
+
+    def is_valid_move(self, player, new_pos):
+        if not self.inside_board(new_pos):
+            return False
+
+        opponent = self.squares["P2" if player == "P1" else "P1"]
+        return pawn_move_allowed(self.squares[player], opponent, square_of(new_pos, self.geometry),
+                                 self.h_edges, self.v_edges, self.geometry)
+
+    def move_pawn(self, player, new_pos):
+        if self.is_valid_move(player, new_pos):
+            self.squares[player] = square_of(new_pos, self.geometry)
+            self._switch_turn()
+            return True
+        return False
+
+    def can_place_wall(self, x, y, orientation):
+        if orientation not in ("H", "V"):
+            return False
+
+        anchors = self.geometry.anchors
+        if x < 0 or x >= anchors or y < 0 or y >= anchors:
+            return False
+
+        return wall_allowed(wall_slot(x, y, orientation, self.geometry), self.wall_mask,
+                            self.h_edges, self.v_edges,
+                            self.squares["P1"], self.squares["P2"], self.geometry)
+
+    def _add_wall(self, x, y, orientation):
+        slot = wall_slot(x, y, orientation, self.geometry)
+        h_bits, v_bits = self.geometry.wall_edge_bits[slot]
+        self.h_edges |= h_bits
+        self.v_edges |= v_bits
+        self.wall_mask |= 1 << slot
+        self.walls.append((x, y, orientation))
+
+    def place_wall(self, player, x, y, orientation):
+        if self.walls_left[player] <= 0:
+            return False
+
+        if self.can_place_wall(x, y, orientation):
+            self._add_wall(x, y, orientation)
+            self.walls_left[player] -= 1
+            self._switch_turn()
+            return True
+
+        return False
+
+    def copy(self):
+        """
+        Return a copy of the board. Masks are immutable ints, so only the
+        small containers need copying.
+        """
+        new = BitBoard.__new__(BitBoard)
+        new.ai_opponent = self.ai_opponent
+        new.GRID_SIZE = self.GRID_SIZE
+        new.geometry = self.geometry
+        new.squares = dict(self.squares)
+        new.h_edges = self.h_edges
+        new.v_edges = self.v_edges
+        new.wall_mask = self.wall_mask
+        new.walls = list(self.walls)
+        new.walls_left = dict(self.walls_left)
+        new.current_player = self.current_player
+        return new
+
+    def _switch_turn(self):
+        self.current_player = "P2" if self.current_player == "P1" else "P1"
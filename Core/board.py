@@ -1,22 +1,44 @@
-from Core.pathfinding import find_path
+from Core.pathfinding import DistanceField, find_path, find_separating_walls, path_exists
+from Core.bitboard import flood_reaches_row
+from Core.geometry import get_geometry
+from Core.pawn_moves import get_pawn_move_table
+from Core.zobrist import get_zobrist
 
 class Board:
+    # Standard size and wall count; Board(grid_size=11) etc. builds a variant
     GRID_SIZE = 9
     MAX_WALLS = 10
 
-    def __init__(self, ai_opponent=False):
-        self.ai_opponent = ai_opponent
+    # Above this many loop-closing candidates, legal_wall_slots runs one cut
+    # analysis per player instead of checking candidates one at a time
+    BULK_CUT_CHECK = 16
+
+    # Check single wall candidates with the bit-parallel flood fill from
+    # Core.bitboard instead of a BFS over blocked_edges
+    FLOOD_FILL = True
 
+    def __init__(self, ai_opponent=False, grid_size=None, max_walls=None):
+        self.ai_opponent = ai_opponent
+        if grid_size is not None:
+            self.GRID_SIZE = grid_size
+        if max_walls is not None:
+            self.MAX_WALLS = max_walls
+        self.geometry = get_geometry(self.GRID_SIZE)
+        self.zobrist = get_zobrist(self.geometry, self.MAX_WALLS)
+
+        # Pawns start in the middle of their home rows
+        middle = self.GRID_SIZE // 2
         self.pawns = {
-            "P1": (0, 4),
-            "P2": (8, 4)
+            "P1": (0, middle),
+            "P2": (self.GRID_SIZE - 1, middle)
         }
 
         # Walls stored as tuples: (x, y, orientation) with orientation "H" or "V"
         self.walls = []
 
         # Blocked edges stored as frozensets of two positions ((r1, c1), (r2, c2))
-        self.blocked_edges = set()
+        # and slot indices (see Core.geometry) of the placed walls
+        self._reset_wall_state()
 
         self.walls_left = {
             "P1": self.MAX_WALLS,
@@ -25,6 +47,9 @@ class Board:
 
         self.current_player = "P1"
 
+        # 64-bit Zobrist key of the position, updated incrementally
+        self.zobrist_key = self.zobrist.compute_key(self)
+
     def inside_board(self, pos):
         r, c = pos
         return 0 <= r < self.GRID_SIZE and 0 <= c < self.GRID_SIZE
@@ -37,6 +62,10 @@ class Board:
         return frozenset((a, b))
 
     def get_adjacent_positions(self, pos):
+        # Shared table entry for in-board squares; callers must not modify it
+        adjacent = self.geometry.adjacent.get(pos)
+        if adjacent is not None:
+            return adjacent
         r, c = pos
         return {
             "up": (r - 1, c),
@@ -47,6 +76,10 @@ class Board:
 
     def _wall_edges_for(self, x, y, o):
         # Return the two blocked edges created by a wall
+        slot = self.geometry.slot_index.get((x, y, o))
+        if slot is not None:
+            return self.geometry.wall_edges[slot]
+
         if o == "H":
             # Blocks movement between rows x and x+1 along columns y and y+1
             a1, b1 = (x, y), (x + 1, y)
@@ -159,22 +192,26 @@ class Board:
 
         return False
 
+    def pawn_move_squares(self, player):
+        """
+        All legal destinations for player's pawn, including jumps and
+        diagonal sidesteps, as square indices r * GRID_SIZE + c.
+        """
+        opponent_player = "P2" if player == "P1" else "P1"
+        r, c = self.pawns[player]
+        orow, ocol = self.pawns[opponent_player]
+        size = self.GRID_SIZE
+        return get_pawn_move_table(self.geometry).moves(
+            r * size + c, orow * size + ocol, self.h_edges, self.v_edges
+        )
+
     def move_pawn(self, player, new_pos):
         if self.is_valid_move(player, new_pos):
-            self.pawns[player] = new_pos
+            self._set_pawn(player, new_pos)
             self._switch_turn()
             return True
         return False
 
-    def _crosses_existing_wall(self, x, y, orientation):
-        # Prevent crossing at the midpoint
-        if orientation == "H":
-            # Horizontal at (x, y) crosses vertical at (x, y) or (x, y+1)
-            return (x, y, "V") in self.walls or (x, y + 1, "V") in self.walls
-        else:  # "V"
-            # Vertical at (x, y) crosses horizontal at (x, y) or (x + 1, y)
-            return (x, y, "H") in self.walls or (x + 1, y, "H") in self.walls
-
     def can_place_wall(self, x, y, orientation):
         if orientation not in ("H", "V"):
             return False
@@ -183,60 +220,341 @@ class Board:
         if x < 0 or x >= self.GRID_SIZE - 1 or y < 0 or y >= self.GRID_SIZE - 1:
             return False
 
-        # Exact duplicate
-        if (x, y, orientation) in self.walls:
+        # Exact duplicate, overlap or crossing with an existing wall
+        slot = self.geometry.slot_index[(x, y, orientation)]
+        if self._conflict_count[slot]:
             return False
 
-        # Prevent crossing with existing walls
-        if self._crosses_existing_wall(x, y, orientation):
-            return False
+        # A wall that cannot close a loop cannot cut anyone off
+        if slot not in self._cut_candidates:
+            return True
 
-        # Tentatively add edges and ensure no overlap at the same segment
-        new_edges = self._wall_edges_for(x, y, orientation)
-        if any(e in self.blocked_edges for e in new_edges):
-            # This catches same-segment overlap more robustly
-            return False
+        return self._keeps_paths(slot)
+
+    def goal_row(self, player):
+        # P1 goes down to the last row, P2 up to row 0
+        return self.GRID_SIZE - 1 if player == "P1" else 0
 
+    def goal_distance(self, player):
+        """
+        Shortest path length from player's pawn to its goal row, ignoring
+        pawns, or float('inf') if walled off. Read from the distance fields.
+        """
+        return self.distance_fields[player].distance(self.pawns[player])
+
+    def _cached_path(self, player):
+        # (path, edges along it) for a known route to the goal row, or None
+        cached = self._paths[player]
+        if cached is None:
+            path = find_path(self.pawns[player], self.goal_row(player),
+                             self.blocked_edges, self.GRID_SIZE)
+            if path is None:
+                return None
+            edges = {frozenset(step) for step in zip(path, path[1:])}
+            cached = self._paths[player] = (path, edges)
+        return cached
+
+    def _keeps_paths(self, slot):
         # Ensure walls do not completely block paths for either player
-        # Simulate placement and run pathfinding
-        start_p1 = self.pawns["P1"]
-        start_p2 = self.pawns["P2"]
-        goals_p1 = [(self.GRID_SIZE - 1, c) for c in range(self.GRID_SIZE)]
-        goals_p2 = [(0, c) for c in range(self.GRID_SIZE)]
-
-        # Temporarily modify blocked_edges
-        prev_edges = set(self.blocked_edges)
-        for e in new_edges:
-            self.blocked_edges.add(e)
-
-        try:
-            p1_has_path = find_path(start_p1, goals_p1, self.blocked_edges, self.GRID_SIZE) is not None
-            p2_has_path = find_path(start_p2, goals_p2, self.blocked_edges, self.GRID_SIZE) is not None
-        finally:
-            # Revert
-            self.blocked_edges = prev_edges
-
-        return p1_has_path and p2_has_path
+        new_edges = self.geometry.wall_edges[slot]
+
+        for player in ("P1", "P2"):
+            cached = self._cached_path(player)
+            if cached is None:
+                return False
+
+            # The known route survives unless the wall lies on it
+            if cached[1].isdisjoint(new_edges):
+                continue
+
+            if self.FLOOD_FILL:
+                h_bits, v_bits = self.geometry.wall_edge_bits[slot]
+                r, c = self.pawns[player]
+                if not flood_reaches_row(r * self.GRID_SIZE + c, self.goal_row(player),
+                                         self.h_edges | h_bits, self.v_edges | v_bits,
+                                         self.geometry):
+                    return False
+                continue
+
+            # Temporarily modify blocked_edges (the new edges are not blocked yet)
+            self.blocked_edges.update(new_edges)
+            try:
+                has_path = path_exists(self.pawns[player], self.goal_row(player),
+                                       self.blocked_edges, self.GRID_SIZE)
+            finally:
+                # Revert
+                self.blocked_edges.difference_update(new_edges)
+
+            if not has_path:
+                return False
+
+        return True
+
+    def blocking_wall_slots(self, slots=None):
+        """
+        Return the open wall slots (or the given ones) that would cut either
+        pawn off from its goal row, using one cut analysis per player
+        instead of a pathfinding pair per slot.
+        """
+        if slots is None:
+            slots = self._open_walls
+        blocking = set()
+        for player in ("P1", "P2"):
+            blocking |= find_separating_walls(self.pawns[player], self.goal_row(player),
+                                              self.blocked_edges, slots, self.geometry)
+        return blocking
+
+    def legal_wall_slots(self):
+        """
+        Return the set of wall slots (see Core.geometry) that can be placed
+        right now, ignoring walls_left. Callers must not modify it.
+        """
+        if self._legal_walls is None:
+            # Only slots that close a loop in the wall graph can block a path
+            candidates = self._cut_candidates & self._open_walls
+            if len(candidates) > self.BULK_CUT_CHECK:
+                legal = self._open_walls - self.blocking_wall_slots(candidates)
+            else:
+                legal = set(self._open_walls)
+                for slot in candidates:
+                    if not self._keeps_paths(slot):
+                        legal.discard(slot)
+            self._legal_walls = legal
+        return self._legal_walls
+
+    def _reset_wall_state(self):
+        self.blocked_edges = set()
+        # Same edges as bit masks, see Core.bitboard
+        self.h_edges = 0
+        self.v_edges = 0
+        self.wall_slots = set()
+
+        # Number of placed walls forbidding each slot; open slots have none
+        self._conflict_count = [0] * len(self.geometry.wall_slots)
+        self._open_walls = set(range(len(self.geometry.wall_slots)))
+
+        # Walls (or the border) touching each lattice point. A slot touching
+        # two already-touched points may close a loop and cut a region off.
+        self._touch = list(self.geometry.border_points)
+        self._cut_candidates = set()
+        for slot in range(len(self.geometry.wall_slots)):
+            self._update_cut_candidate(slot)
+
+        self._legal_walls = None
+
+        # The full Zobrist key is rebuilt by callers
+        self.zobrist_key = 0
+
+        # Cached route to the goal row per player, see _cached_path
+        self._paths = {"P1": None, "P2": None}
+
+        # Distance from every square to each player's goal row
+        self.distance_fields = {
+            player: DistanceField(self.goal_row(player), self.blocked_edges, self.GRID_SIZE)
+            for player in ("P1", "P2")
+        }
+
+    def _update_cut_candidate(self, slot):
+        touch = self._touch
+        p0, p1, p2 = self.geometry.wall_points[slot]
+        if (touch[p0] > 0) + (touch[p1] > 0) + (touch[p2] > 0) >= 2:
+            self._cut_candidates.add(slot)
+        else:
+            self._cut_candidates.discard(slot)
+
+    def _add_wall(self, slot):
+        # Returns the distance field changes, for _remove_wall
+        geometry = self.geometry
+        self.walls.append(geometry.wall_slots[slot])
+        self.wall_slots.add(slot)
+        self.blocked_edges.update(geometry.wall_edges[slot])
+        h_bits, v_bits = geometry.wall_edge_bits[slot]
+        self.h_edges |= h_bits
+        self.v_edges |= v_bits
+        self.zobrist_key ^= self.zobrist.wall[slot]
+
+        for other in geometry.wall_blocks[slot]:
+            self._conflict_count[other] += 1
+            self._open_walls.discard(other)
+
+        for p in geometry.wall_points[slot]:
+            self._touch[p] += 1
+            if self._touch[p] == 1:
+                for other in geometry.point_walls[p]:
+                    self._update_cut_candidate(other)
+
+        # Drop cached routes this wall cuts; they are re-derived on demand
+        for player, cached in self._paths.items():
+            if cached is not None and not cached[1].isdisjoint(geometry.wall_edges[slot]):
+                self._paths[player] = None
+
+        self._legal_walls = None
+
+        return {
+            player: field.place_wall(slot, self.blocked_edges)
+            for player, field in self.distance_fields.items()
+        }
+
+    def _remove_wall(self, slot, field_changes):
+        # Only valid for the most recently added wall
+        geometry = self.geometry
+        self.walls.pop()
+        self.wall_slots.discard(slot)
+        self.blocked_edges.difference_update(geometry.wall_edges[slot])
+        h_bits, v_bits = geometry.wall_edge_bits[slot]
+        self.h_edges &= ~h_bits
+        self.v_edges &= ~v_bits
+        self.zobrist_key ^= self.zobrist.wall[slot]
+
+        for other in geometry.wall_blocks[slot]:
+            self._conflict_count[other] -= 1
+            if not self._conflict_count[other]:
+                self._open_walls.add(other)
+
+        for p in geometry.wall_points[slot]:
+            self._touch[p] -= 1
+            if not self._touch[p]:
+                for other in geometry.point_walls[p]:
+                    self._update_cut_candidate(other)
+
+        for player, changes in field_changes.items():
+            self.distance_fields[player].restore(changes)
+
+        self._legal_walls = None
+
+    def _set_pawn(self, player, new_pos):
+        keys = self.zobrist.pawn[player]
+        self.zobrist_key ^= keys[self.pawns[player]] ^ keys[new_pos]
+        self.pawns[player] = new_pos
+        self._legal_walls = None
+
+        # Keep the cached route if the pawn moved along it
+        cached = self._paths[player]
+        if cached is not None:
+            path, edges = cached
+            if new_pos in path:
+                self._paths[player] = (path[path.index(new_pos):], edges)
+            else:
+                self._paths[player] = None
 
     def place_wall(self, player, x, y, orientation):
         if self.walls_left[player] <= 0:
             return False
 
         if self.can_place_wall(x, y, orientation):
-            self.walls.append((x, y, orientation))
-            for e in self._wall_edges_for(x, y, orientation):
-                self.blocked_edges.add(e)
-            self.walls_left[player] -= 1
+            self._add_wall(self.geometry.slot_index[(x, y, orientation)])
+            self._set_walls_left(player, self.walls_left[player] - 1)
             self._switch_turn()
             return True
 
         return False
 
+    def make_move(self, move):
+        """
+        Apply a move for the current player in place and return an undo token.
+        move is an integer move code (see Core.moves), ('move', (r, c)) or
+        ('wall', x, y, orientation) and must already be legal (e.g. produced
+        by get_possible_moves); it is not re-validated.
+        Tokens must be passed to unmake_move in reverse order.
+        """
+        player = self.current_player
+        paths = self._paths
+        self._paths = dict(paths)
+
+        if isinstance(move, int):
+            num_squares = self.geometry.num_squares
+            if move < num_squares:
+                target, slot = self.geometry.squares[move], None
+            else:
+                target, slot = None, move - num_squares
+        elif move[0] == "move":
+            target, slot = move[1], None
+        else:
+            target, slot = None, self.geometry.slot_index[move[1:]]
+
+        if slot is None:
+            undo = ("move", player, self.pawns[player], paths)
+            self._set_pawn(player, target)
+        else:
+            changes = self._add_wall(slot)
+            self._set_walls_left(player, self.walls_left[player] - 1)
+            undo = ("wall", player, (slot, changes), paths)
+
+        self._switch_turn()
+        return undo
+
+    def unmake_move(self, undo):
+        """
+        Revert the move that returned this undo token from make_move.
+        """
+        kind, player, data, paths = undo
+
+        if kind == "move":
+            keys = self.zobrist.pawn[player]
+            self.zobrist_key ^= keys[self.pawns[player]] ^ keys[data]
+            self.pawns[player] = data
+            self._legal_walls = None
+        else:
+            self._remove_wall(*data)
+            self._set_walls_left(player, self.walls_left[player] + 1)
+
+        self._paths = paths
+        self._switch_turn()
+
+    def sync_walls(self):
+        """
+        Rebuild blocked edges, wall slots and the Zobrist key after self.walls
+        or other position fields were replaced (e.g. by GameState.restore).
+        """
+        walls = self.walls
+        self.walls = []
+        self._reset_wall_state()
+        for wall in walls:
+            self._add_wall(self.geometry.slot_index[wall])
+        self.zobrist_key = self.zobrist.compute_key(self)
+
     def copy(self):
         """
-        Return a deep copy of the board.
+        Return an independent copy of the board. The geometry and Zobrist
+        tables are shared; only the per-board state is duplicated.
         """
-        import copy
-        return copy.deepcopy(self)
+        new = Board.__new__(Board)
+        new.ai_opponent = self.ai_opponent
+        new.GRID_SIZE = self.GRID_SIZE
+        new.MAX_WALLS = self.MAX_WALLS
+        new.geometry = self.geometry
+        new.zobrist = self.zobrist
+
+        new.pawns = dict(self.pawns)
+        new.walls = list(self.walls)
+        new.walls_left = dict(self.walls_left)
+        new.current_player = self.current_player
+
+        new.blocked_edges = set(self.blocked_edges)
+        new.h_edges = self.h_edges
+        new.v_edges = self.v_edges
+        new.wall_slots = set(self.wall_slots)
+        new._conflict_count = list(self._conflict_count)
+        new._open_walls = set(self._open_walls)
+        new._touch = list(self._touch)
+        new._cut_candidates = set(self._cut_candidates)
+        new._legal_walls = None if self._legal_walls is None else set(self._legal_walls)
+        new.zobrist_key = self.zobrist_key
+
+        # Cached routes are replaced, never modified, so the tuples can be shared
+        new._paths = dict(self._paths)
+        new.distance_fields = {player: field.copy() for player, field in self.distance_fields.items()}
+        return new
+
+    def __deepcopy__(self, memo):
+        # copy.deepcopy(board) would also copy the shared tables
+        return self.copy()
+
+    def _set_walls_left(self, player, count):
+        keys = self.zobrist.walls_left[player]
+        self.zobrist_key ^= keys[self.walls_left[player]] ^ keys[count]
+        self.walls_left[player] = count
+
     def _switch_turn(self):
-        self.current_player = "P2" if self.current_player == "P1" else "P1"
\ No newline at end of file
+        self.current_player = "P2" if self.current_player == "P1" else "P1"
+        self.zobrist_key ^= self.zobrist.side
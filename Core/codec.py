@@ -0,0 +1,139 @@
+"""
+Fixed-size binary encoding of board positions.
+
+Each standard 9x9 position packs into a 21-byte record:
+
+    byte 0      P1 pawn square (r * 9 + c)
+    byte 1      P2 pawn square
+    bytes 2-17  placed wall slots as a 128-bit little-endian mask (see Core.geometry)
+    byte 18     P1 walls left
+    byte 19     P2 walls left
+    byte 20     side to move (0 for P1, 1 for P2)
+
+Other board sizes use the same layout with a mask just wide enough for
+their wall slots (5 bytes on 5x5), so every size has its own fixed
+record_size(grid_size).
+
+POSITION_DTYPE describes the 9x9 layout as a NumPy structured dtype, so
+a buffer of records converts to an array without copying field by field.
+"""
+import struct
+
+from Core.frozen_board import FrozenBoard
+from Core.geometry import get_geometry
+from Core.bitboard import GRID_SIZE, NUM_WALL_SLOTS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the array helpers
+    np = None
+
+MASK_BYTES = (NUM_WALL_SLOTS + 7) // 8
+
+_RECORD = struct.Struct("<BB%dsBBB" % MASK_BYTES)
+RECORD_SIZE = _RECORD.size
+
+# Grid size -> record struct
+_RECORDS = {GRID_SIZE: _RECORD}
+
+
+def _record(grid_size):
+    record = _RECORDS.get(grid_size)
+    if record is None:
+        mask_bytes = (len(get_geometry(grid_size).wall_slots) + 7) // 8
+        record = _RECORDS[grid_size] = struct.Struct("<BB%dsBBB" % mask_bytes)
+    return record
+
+
+def record_size(grid_size=GRID_SIZE):
+    """
+    Bytes per encoded position on a grid_size board.
+    """
+    return _record(grid_size).size
+
+_SIDES = ("P1", "P2")
+
+if np is not None:
+    POSITION_DTYPE = np.dtype([
+        ("pawns", "u1", (2,)),
+        ("walls", "u1", (MASK_BYTES,)),
+        ("walls_left", "u1", (2,)),
+        ("side", "u1"),
+    ])
+else:
+    POSITION_DTYPE = None
+
+
+def encode_position(board):
+    """
+    Pack a Board, BitBoard or FrozenBoard into a record_size(grid_size)
+    bytes record (RECORD_SIZE on the standard board).
+    """
+    if not isinstance(board, FrozenBoard):
+        board = FrozenBoard.from_board(board)
+
+    record = _record(board.grid_size)
+    return record.pack(
+        board.pawn_squares[0],
+        board.pawn_squares[1],
+        board.wall_mask.to_bytes(record.size - 5, "little"),
+        board.wall_counts[0],
+        board.wall_counts[1],
+        _SIDES.index(board.current_player)
+    )
+
+
+def decode_position(data, grid_size=GRID_SIZE):
+    """
+    Unpack a record into a FrozenBoard.
+    """
+    p1, p2, mask_bytes, left1, left2, side = _record(grid_size).unpack(data)
+    wall_mask = int.from_bytes(mask_bytes, "little")
+    wall_edge_bits = get_geometry(grid_size).wall_edge_bits
+
+    h_edges = v_edges = 0
+    slot = 0
+    mask = wall_mask
+    while mask:
+        if mask & 1:
+            h_bits, v_bits = wall_edge_bits[slot]
+            h_edges |= h_bits
+            v_edges |= v_bits
+        mask >>= 1
+        slot += 1
+
+    return FrozenBoard((p1, p2), h_edges, v_edges, wall_mask, (left1, left2), _SIDES[side],
+                       grid_size)
+
+
+def decode_board(data, ai_opponent=False, grid_size=GRID_SIZE):
+    """
+    Unpack a record into a mutable Board.
+    """
+    return decode_position(data, grid_size).to_board(ai_opponent)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is required for position arrays")
+
+
+def positions_to_array(boards):
+    """
+    Encode an iterable of 9x9 boards into a NumPy array of POSITION_DTYPE.
+    """
+    _require_numpy()
+    data = b"".join(encode_position(board) for board in boards)
+    return np.frombuffer(data, dtype=POSITION_DTYPE).copy()
+
+
+def array_to_positions(array):
+    """
+    Decode a POSITION_DTYPE array back into a list of FrozenBoards.
+    """
+    _require_numpy()
+    data = np.ascontiguousarray(array, dtype=POSITION_DTYPE).tobytes()
+    return [
+        decode_position(data[i:i + RECORD_SIZE])
+        for i in range(0, len(data), RECORD_SIZE)
+    ]
@@ -0,0 +1,186 @@
+from collections import namedtuple
+
+from Core.board import Board
+from Core.geometry import get_geometry
+from Core.moves import decode_move
+from Core.pawn_moves import get_pawn_move_table
+from Core.bitboard import (
+    GRID_SIZE, edge_blocked, pawn_move_allowed, position_of, square_of, wall_allowed, wall_slot
+)
+
+_PLAYERS = ("P1", "P2")
+
+_FrozenFields = namedtuple(
+    "FrozenBoard",
+    "pawn_squares h_edges v_edges wall_mask wall_counts current_player grid_size",
+    defaults=(GRID_SIZE,)
+)
+
+
+class FrozenBoard(_FrozenFields):
+    """
+    Immutable, hashable board position.
+
+    pawn_squares and wall_counts are (P1, P2) tuples, the edge and wall masks
+    use the Core.bitboard layout for a grid_size board. Applying a move returns a new FrozenBoard
+    that shares every unchanged field with its parent, so snapshots are cheap
+    and safe to cache or hand to other threads.
+    """
+    __slots__ = ()
+
+    MAX_WALLS = Board.MAX_WALLS
+
+    @classmethod
+    def initial(cls, grid_size=GRID_SIZE):
+        return cls.from_board(Board(grid_size=grid_size))
+
+    @classmethod
+    def from_board(cls, board):
+        """
+        Snapshot a Board (or BitBoard).
+        """
+        geometry = get_geometry(board.GRID_SIZE)
+        h_edges = v_edges = wall_mask = 0
+        for x, y, o in board.walls:
+            slot = wall_slot(x, y, o, geometry)
+            h_bits, v_bits = geometry.wall_edge_bits[slot]
+            h_edges |= h_bits
+            v_edges |= v_bits
+            wall_mask |= 1 << slot
+
+        return cls(
+            tuple(square_of(board.pawns[p], geometry) for p in _PLAYERS),
+            h_edges,
+            v_edges,
+            wall_mask,
+            tuple(board.walls_left[p] for p in _PLAYERS),
+            board.current_player,
+            geometry.size
+        )
+
+    @property
+    def GRID_SIZE(self):
+        return self.grid_size
+
+    @property
+    def geometry(self):
+        return get_geometry(self.grid_size)
+
+    def restore_into(self, board):
+        """
+        Write this position into a mutable Board of the same size.
+        """
+        geometry = self.geometry
+        board.pawns = {p: position_of(s, geometry) for p, s in zip(_PLAYERS, self.pawn_squares)}
+        board.walls = self.walls
+        board.walls_left = dict(zip(_PLAYERS, self.wall_counts))
+        board.current_player = self.current_player
+        board.sync_walls()
+
+    def to_board(self, ai_opponent=False):
+        board = Board(ai_opponent, self.grid_size)
+        self.restore_into(board)
+        return board
+
+    # Read-only views matching the Board attributes
+
+    @property
+    def pawns(self):
+        geometry = self.geometry
+        return {p: position_of(s, geometry) for p, s in zip(_PLAYERS, self.pawn_squares)}
+
+    @property
+    def walls_left(self):
+        return dict(zip(_PLAYERS, self.wall_counts))
+
+    @property
+    def walls(self):
+        # Placed walls in slot order
+        mask = self.wall_mask
+        return [wall for slot, wall in enumerate(self.geometry.wall_slots) if (mask >> slot) & 1]
+
+    def inside_board(self, pos):
+        r, c = pos
+        return 0 <= r < self.grid_size and 0 <= c < self.grid_size
+
+    def get_adjacent_positions(self, pos):
+        return self.geometry.adjacent[pos]
+
+    def is_wall_blocking(self, pos, new_pos):
+        geometry = self.geometry
+        return edge_blocked(self.h_edges, self.v_edges, square_of(pos, geometry),
+                            square_of(new_pos, geometry), geometry)
+
+    def is_valid_move(self, player, new_pos):
+        if not self.inside_board(new_pos):
+            return False
+        i = _PLAYERS.index(player)
+        geometry = self.geometry
+        return pawn_move_allowed(self.pawn_squares[i], self.pawn_squares[1 - i],
+                                 square_of(new_pos, geometry), self.h_edges, self.v_edges,
+                                 geometry)
+
+    def can_place_wall(self, x, y, orientation):
+        if orientation not in ("H", "V"):
+            return False
+        geometry = self.geometry
+        if x < 0 or x >= geometry.anchors or y < 0 or y >= geometry.anchors:
+            return False
+        return wall_allowed(wall_slot(x, y, orientation, geometry), self.wall_mask,
+                            self.h_edges, self.v_edges, *self.pawn_squares, geometry)
+
+    def legal_moves(self):
+        """
+        Move codes (see Core.moves) for the side to move: pawn squares,
+        then num_squares + slot for every legal wall.
+        """
+        geometry = self.geometry
+        i = _PLAYERS.index(self.current_player)
+        own, opponent = self.pawn_squares[i], self.pawn_squares[1 - i]
+
+        moves = list(get_pawn_move_table(geometry).moves(own, opponent, self.h_edges, self.v_edges))
+        if self.wall_counts[i] > 0:
+            for slot in range(len(geometry.wall_slots)):
+                if wall_allowed(slot, self.wall_mask, self.h_edges, self.v_edges,
+                                *self.pawn_squares, geometry):
+                    moves.append(geometry.num_squares + slot)
+        return moves
+
+    def apply_move(self, move):
+        """
+        Return the position after the side to move plays move, given as a
+        move code (see Core.moves), ('move', (r, c)) or ('wall', x, y, orientation),
+        or None if illegal.
+        """
+        geometry = self.geometry
+        if isinstance(move, int):
+            move = decode_move(move, geometry)
+
+        player = self.current_player
+        i = _PLAYERS.index(player)
+        next_player = _PLAYERS[1 - i]
+
+        if move[0] == "move":
+            if not self.is_valid_move(player, move[1]):
+                return None
+            squares = list(self.pawn_squares)
+            squares[i] = square_of(move[1], geometry)
+            # Walls, masks and counts are shared with the parent
+            return self._replace(pawn_squares=tuple(squares), current_player=next_player)
+
+        _, x, y, orientation = move
+        if self.wall_counts[i] <= 0 or not self.can_place_wall(x, y, orientation):
+            return None
+
+        slot = wall_slot(x, y, orientation, geometry)
+        h_bits, v_bits = geometry.wall_edge_bits[slot]
+        counts = list(self.wall_counts)
+        counts[i] -= 1
+        # Pawn squares are shared with the parent
+        return self._replace(
+            h_edges=self.h_edges | h_bits,
+            v_edges=self.v_edges | v_bits,
+            wall_mask=self.wall_mask | (1 << slot),
+            wall_counts=tuple(counts),
+            current_player=next_player
+        )
@@ -1,17 +1,26 @@
-import copy
+from Core.frozen_board import FrozenBoard
 
 
 class GameState:
     def __init__(self, board):
-        # Deep copy everything
-        self.pawns = copy.deepcopy(board.pawns)
-        self.walls = copy.deepcopy(board.walls)  # store all wall dicts
-        self.walls_left = copy.deepcopy(board.walls_left)
-        self.current_player = board.current_player
+        # Immutable snapshot; nothing needs copying
+        self.snapshot = FrozenBoard.from_board(board)
 
-    def restore(self, board):
-        board.pawns = copy.deepcopy(self.pawns)
-        board.walls = copy.deepcopy(self.walls)
-        board.walls_left = copy.deepcopy(self.walls_left)
-        board.current_player = self.current_player
+    @property
+    def pawns(self):
+        return self.snapshot.pawns
+
+    @property
+    def walls(self):
+        return self.snapshot.walls
+
+    @property
+    def walls_left(self):
+        return self.snapshot.walls_left
 
+    @property
+    def current_player(self):
+        return self.snapshot.current_player
+
+    def restore(self, board):
+        self.snapshot.restore_into(board)
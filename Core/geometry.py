@@ -0,0 +1,184 @@
+"""
+Static geometry tables for the Quoridor board.
+
+Everything here depends only on the board size, so the tables are built
+once and shared by every Board. Wall slots are numbered in the order the
+AI generates them:
+
+    slot = (x * (size - 1) + y) * 2 + (0 for "H", 1 for "V")
+"""
+
+
+class Geometry:
+    def __init__(self, size):
+        self.size = size
+        self.anchors = size - 1
+
+        # One shared edge key object per edge, see _edge
+        self._edge_keys = {}
+
+        self.squares = [(r, c) for r in range(size) for c in range(size)]
+        self.num_squares = size * size
+
+        # Direction -> position, exactly what Board.get_adjacent_positions returns
+        # (positions may lie outside the board)
+        self.adjacent = {}
+        # In-board orthogonal neighbours, in up/down/left/right order
+        self.neighbours = {}
+
+        for r, c in self.squares:
+            adjacent = {
+                "up": (r - 1, c),
+                "down": (r + 1, c),
+                "left": (r, c - 1),
+                "right": (r, c + 1)
+            }
+            self.adjacent[(r, c)] = adjacent
+            self.neighbours[(r, c)] = tuple(
+                p for p in adjacent.values()
+                if 0 <= p[0] < size and 0 <= p[1] < size
+            )
+
+        # Square index -> ((neighbour square index, edge key), ...) for pathfinding
+        self.square_links = [
+            tuple((nr * size + nc, self._edge(pos, (nr, nc))) for nr, nc in self.neighbours[pos])
+            for pos in self.squares
+        ]
+
+        self.wall_slots = []
+        self.slot_index = {}
+        for x in range(self.anchors):
+            for y in range(self.anchors):
+                for o in ("H", "V"):
+                    self.slot_index[(x, y, o)] = len(self.wall_slots)
+                    self.wall_slots.append((x, y, o))
+
+        # The two edges blocked by each slot
+        self.wall_edges = [self._edges_for(*wall) for wall in self.wall_slots]
+
+        # Same edges as (a, b) pairs of square indices r * size + c, a < b
+        self.wall_square_edges = [
+            tuple(
+                tuple(sorted(r * size + c for r, c in e))
+                for e in edges
+            )
+            for edges in self.wall_edges
+        ]
+
+        # Same edges as (h_bits, v_bits) masks in the Core.bitboard layout:
+        # h bit s blocks s -> s + size, v bit s blocks s -> s + 1
+        self.wall_edge_bits = []
+        for x, y, o in self.wall_slots:
+            s = x * size + y
+            if o == "H":
+                self.wall_edge_bits.append(((1 << s) | (1 << (s + 1)), 0))
+            else:
+                self.wall_edge_bits.append((0, (1 << s) | (1 << (s + size))))
+
+        # Square masks for bit-parallel flood fills
+        self.full_mask = (1 << self.num_squares) - 1
+        self.row_masks = [((1 << size) - 1) << (r * size) for r in range(size)]
+        # Squares with a right-hand neighbour (every column but the last)
+        self.not_last_column = self.full_mask & ~sum(
+            1 << (r * size + size - 1) for r in range(size)
+        )
+
+        # Edge -> slots that block it
+        edge_walls = {}
+        for slot, edges in enumerate(self.wall_edges):
+            for e in edges:
+                edge_walls.setdefault(e, []).append(slot)
+        self.edge_walls = {e: tuple(slots) for e, slots in edge_walls.items()}
+
+        # Slot -> placed slots that forbid it (itself, overlaps, crossings)
+        self.wall_conflicts = [
+            self._conflicts_for(slot, *wall)
+            for slot, wall in enumerate(self.wall_slots)
+        ]
+
+        # Slot -> slots it forbids once placed (inverse of wall_conflicts)
+        wall_blocks = [[] for _ in self.wall_slots]
+        for slot, conflicts in enumerate(self.wall_conflicts):
+            for other in conflicts:
+                wall_blocks[other].append(slot)
+        self.wall_blocks = [tuple(slots) for slots in wall_blocks]
+
+        # Slot -> bit mask of the slots in wall_conflicts
+        self.wall_conflict_masks = [
+            sum(1 << other for other in conflicts) for conflicts in self.wall_conflicts
+        ]
+
+        # Lattice points are the corners between squares, numbered
+        # i * (size + 1) + j for 0 <= i, j <= size. Each wall touches three.
+        self.lattice_size = size + 1
+        self.wall_points = [self._points_for(*wall) for wall in self.wall_slots]
+
+        # Lattice point -> slots touching it
+        point_walls = [[] for _ in range(self.lattice_size * self.lattice_size)]
+        for slot, points in enumerate(self.wall_points):
+            for p in points:
+                point_walls[p].append(slot)
+        self.point_walls = [tuple(slots) for slots in point_walls]
+
+        # Points on the board border count as already touched by a wall
+        self.border_points = [
+            1 if i in (0, size) or j in (0, size) else 0
+            for i in range(self.lattice_size)
+            for j in range(self.lattice_size)
+        ]
+
+    def _edge(self, a, b):
+        # Same normalized edge key as Board.edge_between, interned so table
+        # lookups hit the same object
+        key = frozenset((a, b))
+        return self._edge_keys.setdefault(key, key)
+
+    def _edges_for(self, x, y, o):
+        if o == "H":
+            # Blocks movement between rows x and x+1 along columns y and y+1
+            return (self._edge((x, y), (x + 1, y)), self._edge((x, y + 1), (x + 1, y + 1)))
+        # Blocks movement between columns y and y+1 along rows x and x+1
+        return (self._edge((x, y), (x, y + 1)), self._edge((x + 1, y), (x + 1, y + 1)))
+
+    def _points_for(self, x, y, o):
+        n = self.lattice_size
+        if o == "H":
+            return ((x + 1) * n + y, (x + 1) * n + y + 1, (x + 1) * n + y + 2)
+        return (x * n + y + 1, (x + 1) * n + y + 1, (x + 2) * n + y + 1)
+
+    def _conflicts_for(self, slot, x, y, o):
+        conflicts = {slot}
+
+        # Overlap: any slot sharing one of our edges
+        for e in self.wall_edges[slot]:
+            conflicts.update(self.edge_walls[e])
+
+        # Crossing, as enforced by the original Board rules:
+        # H at (x, y) is refused next to V at (x, y) or (x, y+1),
+        # V at (x, y) is refused next to H at (x, y) or (x+1, y)
+        if o == "H":
+            crossing = ((x, y, "V"), (x, y + 1, "V"))
+        else:
+            crossing = ((x, y, "H"), (x + 1, y, "H"))
+        for wall in crossing:
+            if wall in self.slot_index:
+                conflicts.add(self.slot_index[wall])
+
+        return frozenset(conflicts)
+
+
+_GEOMETRIES = {}
+
+
+def get_geometry(size):
+    """
+    Return the shared geometry tables for a board of the given size.
+    """
+    geometry = _GEOMETRIES.get(size)
+    if geometry is None:
+        geometry = _GEOMETRIES[size] = Geometry(size)
+    return geometry
+
+
+# Standard 9x9 board, built at import
+GEOMETRY = get_geometry(9)
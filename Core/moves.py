@@ -0,0 +1,58 @@
+"""
+Compact integer move encoding.
+
+    0 .. size*size - 1                  pawn move to square r * size + c
+    size*size .. size*size + slots - 1  wall placement in that slot (see Core.geometry)
+
+On the 9x9 board pawn moves are 0..80 and walls 81..208, so move lists fit
+in array('B') / uint8 buffers.
+"""
+from Core.geometry import GEOMETRY
+
+
+def pawn_move(pos, geometry=GEOMETRY):
+    r, c = pos
+    return r * geometry.size + c
+
+
+def wall_move(x, y, orientation, geometry=GEOMETRY):
+    return geometry.num_squares + geometry.slot_index[(x, y, orientation)]
+
+
+def is_wall_move(move, geometry=GEOMETRY):
+    return move >= geometry.num_squares
+
+
+def move_target(move, geometry=GEOMETRY):
+    """
+    Destination (r, c) of a pawn move.
+    """
+    return geometry.squares[move]
+
+
+def move_wall(move, geometry=GEOMETRY):
+    """
+    (x, y, orientation) of a wall move.
+    """
+    return geometry.wall_slots[move - geometry.num_squares]
+
+
+def decode_move(move, geometry=GEOMETRY):
+    """
+    Expand a move code into ('move', (r, c)) or ('wall', x, y, orientation).
+    """
+    if move < geometry.num_squares:
+        return ("move", geometry.squares[move])
+    return ("wall",) + geometry.wall_slots[move - geometry.num_squares]
+
+
+def encode_move(move, geometry=GEOMETRY):
+    """
+    Inverse of decode_move; also accepts a move that is already a code.
+    """
+    if isinstance(move, int):
+        return move
+    if move[0] == "move":
+        return pawn_move(move[1], geometry)
+    _, x, y, orientation = move
+    return wall_move(x, y, orientation, geometry)
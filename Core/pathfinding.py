@@ -1,50 +1,432 @@
-from collections import deque
+import heapq
+import random
+from collections import OrderedDict, deque
+from Core.geometry import get_geometry
+
+
+class _Scratch:
+    # Per-size BFS buffers reused across calls; a generation counter marks
+    # visited squares so nothing needs clearing between searches.
+    # Not thread-safe.
+    def __init__(self, num_squares):
+        self.mark = [0] * num_squares
+        self.parent = [0] * num_squares
+        self.queue = [0] * num_squares
+        self.generation = 0
+
+
+_scratch = {}
+
+
+def _search(start_pos, goal, blocked_edges, grid_size):
+    """
+    BFS over square indices with parent pointers.
+    goal is a goal row, or a collection of goal positions.
+    Returns (scratch, reached goal square or -1, start square).
+    """
+    geometry = get_geometry(grid_size)
+    scratch = _scratch.get(grid_size)
+    if scratch is None:
+        scratch = _scratch[grid_size] = _Scratch(geometry.num_squares)
+
+    if isinstance(goal, int):
+        goal_squares = range(goal * grid_size, goal * grid_size + grid_size)
+    else:
+        goal_squares = {r * grid_size + c for r, c in goal}
+
+    start = start_pos[0] * grid_size + start_pos[1]
+    if start in goal_squares:
+        return scratch, start, start
+
+    scratch.generation += 1
+    generation = scratch.generation
+    mark = scratch.mark
+    parent = scratch.parent
+    queue = scratch.queue
+    links = geometry.square_links
+
+    mark[start] = generation
+    queue[0] = start
+    head, tail = 0, 1
+
+    while head < tail:
+        s = queue[head]
+        head += 1
+
+        # In-board orthogonal moves
+        for n, edge in links[s]:
+            if mark[n] != generation and edge not in blocked_edges:
+                mark[n] = generation
+                parent[n] = s
+                if n in goal_squares:
+                    return scratch, n, start
+                queue[tail] = n
+                tail += 1
+
+    return scratch, -1, start
+
 
 def find_path(start_pos, goal_positions, blocked_edges, grid_size):
     """
-    BFS to find a path from start_pos to any of goal_positions.
+    BFS to find a path from start_pos to its goal row (an int) or to any
+    of goal_positions.
     Returns a path (list of positions) or None if no path exists.
     """
-    queue = deque([(start_pos, [start_pos])])
-    visited = set([start_pos])
+    scratch, s, start = _search(start_pos, goal_positions, blocked_edges, grid_size)
+    if s < 0:
+        return None
 
-    while queue:
-        pos, path = queue.popleft()
-        if pos in goal_positions:
-            return path
+    squares = get_geometry(grid_size).squares
+    parent = scratch.parent
+    path = [squares[s]]
+    while s != start:
+        s = parent[s]
+        path.append(squares[s])
+    path.reverse()
+    return path
 
-        r, c = pos
-        # 4 orthogonal moves
-        neighbors = [(r-1, c), (r+1, c), (r, c-1), (r, c+1)]
-        for n in neighbors:
-            if 0 <= n[0] < grid_size and 0 <= n[1] < grid_size:
-                if frozenset((pos, n)) not in blocked_edges and n not in visited:
-                    visited.add(n)
-                    queue.append((n, path + [n]))
 
-    return None
+def path_length(start_pos, goal_row, blocked_edges, grid_size):
+    """
+    Length of the shortest path to goal_row, or None; builds no path.
+    """
+    scratch, s, start = _search(start_pos, goal_row, blocked_edges, grid_size)
+    if s < 0:
+        return None
 
-def shortest_path(player, board_state):
+    parent = scratch.parent
+    length = 0
+    while s != start:
+        s = parent[s]
+        length += 1
+    return length
+
+
+def path_exists(start_pos, goal_row, blocked_edges, grid_size):
     """
-    BFS to find the length of the shortest path from player's pawn to goal row.
-    Returns integer distance if path exists, else float('inf').
+    True if start_pos can still reach goal_row.
+    """
+    return _search(start_pos, goal_row, blocked_edges, grid_size)[1] >= 0
+
+# Fixed seed so cut detection is reproducible between runs
+_cut_labels = random.Random(2024)
+
+
+def find_separating_walls(start_pos, goal_row, blocked_edges, slots, geometry):
+    """
+    Return the wall slots among slots whose placement would disconnect
+    start_pos from goal_row. Slots must not overlap existing walls.
+
+    One DFS over the open cell graph, with the goal row joined to a virtual
+    target node, finds the bridges (lowlink) and labels every edge with the
+    xor of random labels of the back edges spanning it. A slot with a bridge
+    above the pawn separates it outright; two edges form a 2-edge cut only if
+    their labels match, so only those slots are confirmed with a BFS.
     """
-    start_pos = board_state.pawns[player]
-    goal_row = 8 if player == "P1" else 0
+    n = geometry.size
+    target = n * n
+    start = start_pos[0] * n + start_pos[1]
+
+    # Adjacency of the open cell graph plus the virtual target node
+    adj = [[] for _ in range(target + 1)]
+    for pos in geometry.squares:
+        s = pos[0] * n + pos[1]
+        for nb in geometry.neighbours[pos]:
+            t = nb[0] * n + nb[1]
+            if s < t and frozenset((pos, nb)) not in blocked_edges:
+                adj[s].append(t)
+                adj[t].append(s)
+    for c in range(n):
+        adj[target].append(goal_row * n + c)
+        adj[goal_row * n + c].append(target)
+
+    # Iterative DFS from the target node
+    tin = [-1] * (target + 1)
+    tout = [0] * (target + 1)
+    low = [0] * (target + 1)
+    parent = [-1] * (target + 1)
+    span = [0] * (target + 1)  # after the DFS: label of the tree edge into a node
+    back_labels = {}
+    timer = 0
 
-    queue = deque([(start_pos, 0)])  # store (position, distance)
-    visited = set([start_pos])
+    tin[target] = 0
+    stack = [(target, iter(adj[target]))]
+    while stack:
+        v, it = stack[-1]
+        for w in it:
+            if w == parent[v]:
+                continue
+            if tin[w] == -1:
+                timer += 1
+                parent[w] = v
+                tin[w] = low[w] = timer
+                stack.append((w, iter(adj[w])))
+                break
+            if tin[w] < tin[v]:
+                # Back edge to an ancestor
+                low[v] = min(low[v], tin[w])
+                label = _cut_labels.getrandbits(64)
+                back_labels[(w, v) if w < v else (v, w)] = label
+                span[v] ^= label
+                span[w] ^= label
+        else:
+            stack.pop()
+            tout[v] = timer
+            p = parent[v]
+            if p != -1:
+                low[p] = min(low[p], low[v])
+                span[p] ^= span[v]
 
-    while queue:
-        pos, dist = queue.popleft()
-        r, c = pos
+    if tin[start] == -1:
+        return set(slots)
 
-        if r == goal_row:
-            return dist
+    def edge_info(a, b):
+        # (tree edge child or None, label), or None outside the target's component
+        if tin[a] == -1:
+            return None
+        if parent[b] == a:
+            return b, span[b]
+        if parent[a] == b:
+            return a, span[a]
+        return None, back_labels[(a, b)]
 
-        for move in board_state.get_adjacent_positions(pos).values():
-            if board_state.is_valid_move(player, move) and move not in visited:
-                visited.add(move)
-                queue.append((move, dist + 1))
+    separating = set()
+    for slot in slots:
+        (a1, b1), (a2, b2) = geometry.wall_square_edges[slot]
+        first = edge_info(a1, b1)
+        second = edge_info(a2, b2)
+
+        cut = False
+        for info in (first, second):
+            if info is None or info[0] is None:
+                continue
+            child = info[0]
+            # A bridge above the pawn separates it from the goal row
+            if low[child] > tin[parent[child]] and tin[child] <= tin[start] <= tout[child]:
+                cut = True
+                break
+
+        if not cut and first is not None and second is not None \
+                and (first[0] is not None or second[0] is not None) \
+                and first[1] == second[1]:
+            # Possible 2-edge cut: confirm with a BFS
+            new_edges = geometry.wall_edges[slot]
+            blocked_edges.update(new_edges)
+            try:
+                cut = not path_exists(start_pos, goal_row, blocked_edges, n)
+            finally:
+                blocked_edges.difference_update(new_edges)
+
+        if cut:
+            separating.add(slot)
+
+    return separating
+
+
+class PathCache:
+    """
+    Bounded LRU cache of path lengths keyed by (board size and wall set, start, player).
+
+    A distance depends only on the walls and the start square, so repeated
+    evaluations of boards sharing a wall layout hit the same key. The
+    search does not use it: every searchable board is a Core.board.Board,
+    which reads distances from its distance fields. Only boards without
+    fields (BitBoard, FrozenBoard) evaluated outside the search reach it.
+    """
 
-    return float('inf')
+    def __init__(self, max_entries=200000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, key, compute):
+        """
+        Return the cached value for key, or store and return compute().
+        """
+        entries = self.entries
+        value = entries.get(key)
+        if value is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = entries[key] = compute()
+        # Evict least recently used entries over the cap
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return value
+
+    def peek(self, key):
+        """
+        Cached value for key or None, without touching the LRU order or counters.
+        """
+        return self.entries.get(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def wall_set_key(board):
+    """
+    Hashable key for the placed walls of any board type. Includes the
+    board size, since the same wall mask means different walls on another size.
+    """
+    wall_mask = getattr(board, "wall_mask", None)
+    if wall_mask is not None:
+        return board.GRID_SIZE, wall_mask
+    return board.GRID_SIZE, frozenset(board.walls)
+
+
+# Shared by heuristics.shortest_path for boards without distance fields;
+# searched Boards never reach it
+distance_cache = PathCache()
+
+
+class DistanceField:
+    """
+    Distance from every square to one goal row, through the current walls.
+
+    Built by a multi-source BFS from the goal row. place_wall repairs only
+    the squares whose distance grows and returns their old values, which
+    restore puts back, so the field follows make_move / unmake_move.
+    """
+
+    def __init__(self, goal_row, blocked_edges, grid_size):
+        self.geometry = get_geometry(grid_size)
+        self.goal_row = goal_row
+        # Larger than any real distance; marks squares cut off from the goal row
+        self.unreachable = self.geometry.num_squares
+        self.goal_squares = range(goal_row * grid_size, goal_row * grid_size + grid_size)
+        self.compute(blocked_edges)
+
+    def compute(self, blocked_edges):
+        """
+        Rebuild the whole field.
+        """
+        links = self.geometry.square_links
+        dist = [self.unreachable] * self.geometry.num_squares
+        queue = deque()
+        for s in self.goal_squares:
+            dist[s] = 0
+            queue.append(s)
+
+        while queue:
+            s = queue.popleft()
+            d = dist[s] + 1
+            for n, edge in links[s]:
+                if dist[n] > d and edge not in blocked_edges:
+                    dist[n] = d
+                    queue.append(n)
+
+        self.dist = dist
+
+    def copy(self):
+        """
+        Independent copy sharing the geometry tables.
+        """
+        new = DistanceField.__new__(DistanceField)
+        new.geometry = self.geometry
+        new.goal_row = self.goal_row
+        new.unreachable = self.unreachable
+        new.goal_squares = self.goal_squares
+        new.dist = list(self.dist)
+        return new
+
+    def distance(self, pos):
+        """
+        Shortest path length from pos to the goal row, or float('inf').
+        """
+        d = self.dist[pos[0] * self.geometry.size + pos[1]]
+        return d if d < self.unreachable else float('inf')
+
+    def place_wall(self, slot, blocked_edges):
+        """
+        Repair the field after the wall in slot was added to blocked_edges.
+        Returns [(square, old distance), ...] for restore.
+        """
+        dist = self.dist
+        links = self.geometry.square_links
+        goal_squares = self.goal_squares
+
+        # Squares whose shortest route used one of the new edges
+        heap = []
+        for a, b in self.geometry.wall_square_edges[slot]:
+            if dist[a] == dist[b] + 1:
+                heapq.heappush(heap, (dist[a], a))
+            elif dist[b] == dist[a] + 1:
+                heapq.heappush(heap, (dist[b], b))
+
+        # In increasing distance order, collect squares left without a
+        # neighbour one step closer to the goal; their children may follow
+        affected = set()
+        while heap:
+            d, s = heapq.heappop(heap)
+            if s in affected or s in goal_squares:
+                continue
+            supported = False
+            for n, edge in links[s]:
+                if dist[n] == d - 1 and n not in affected and edge not in blocked_edges:
+                    supported = True
+                    break
+            if supported:
+                continue
+            affected.add(s)
+            for n, edge in links[s]:
+                if dist[n] == d + 1 and edge not in blocked_edges:
+                    heapq.heappush(heap, (d + 1, n))
+
+        if not affected:
+            return []
+
+        changes = [(s, dist[s]) for s in affected]
+        for s in affected:
+            dist[s] = self.unreachable
+
+        # Re-seed the affected region from its intact border, then expand
+        heap = []
+        for s in affected:
+            best = self.unreachable
+            for n, edge in links[s]:
+                if n not in affected and dist[n] + 1 < best and edge not in blocked_edges:
+                    best = dist[n] + 1
+            if best < self.unreachable:
+                dist[s] = best
+                heapq.heappush(heap, (best, s))
+
+        while heap:
+            d, s = heapq.heappop(heap)
+            if d > dist[s]:
+                continue
+            for n, edge in links[s]:
+                if n in affected and d + 1 < dist[n] and edge not in blocked_edges:
+                    dist[n] = d + 1
+                    heapq.heappush(heap, (d + 1, n))
+
+        return changes
+
+    def restore(self, changes):
+        """
+        Undo a place_wall repair.
+        """
+        dist = self.dist
+        for s, d in changes:
+            dist[s] = d
+
+
+def shortest_path(player, board_state):
+    """
+    Length of the shortest path from player's pawn to goal row.
+    Returns integer distance if path exists, else float('inf').
+    """
+    return board_state.goal_distance(player)
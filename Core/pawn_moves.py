@@ -0,0 +1,107 @@
+"""
+Table-driven pawn move generation.
+
+The legal destinations of a pawn depend only on its square, the opponent's
+square when the two are adjacent, and the walls on the edges around both
+pawns. PawnMoveTable memoizes the destination list per
+(own square, opponent square, local wall mask) the first time that
+combination is seen, so later lookups cost a few bit operations.
+
+Destinations follow Board.is_valid_move: simple steps, the straight jump
+over an adjacent opponent and, when that jump is walled off or leaves the
+board, the diagonal sidesteps around the opponent.
+"""
+
+# Direction order used by the local masks: up, down, left, right
+_PERPENDICULAR = ((2, 3), (2, 3), (0, 1), (0, 1))
+
+
+class PawnMoveTable:
+    def __init__(self, geometry):
+        size = geometry.size
+        self.size = size
+
+        # Square -> neighbour square per direction, or -1 off the board
+        self.steps = []
+        # Square -> mask of directions that leave the board
+        self.border = []
+        for r, c in geometry.squares:
+            s = r * size + c
+            self.steps.append((
+                s - size if r > 0 else -1,
+                s + size if r < size - 1 else -1,
+                s - 1 if c > 0 else -1,
+                s + 1 if c < size - 1 else -1
+            ))
+            self.border.append(
+                (r == 0) | (r == size - 1) << 1 | (c == 0) << 2 | (c == size - 1) << 3
+            )
+
+        self._moves = {}
+
+    def local_mask(self, square, h_edges, v_edges):
+        """
+        4-bit mask of blocked directions (up, down, left, right) from square.
+        """
+        up, down, left, right = self.steps[square]
+        mask = self.border[square]
+        if up >= 0:
+            mask |= (h_edges >> up) & 1
+        if down >= 0:
+            mask |= ((h_edges >> square) & 1) << 1
+        if left >= 0:
+            mask |= ((v_edges >> left) & 1) << 2
+        if right >= 0:
+            mask |= ((v_edges >> square) & 1) << 3
+        return mask
+
+    def moves(self, own, opponent, h_edges, v_edges):
+        """
+        Tuple of legal destination squares for the pawn on own.
+        """
+        mask = self.local_mask(own, h_edges, v_edges)
+        if opponent in self.steps[own]:
+            key = (own, opponent, mask | self.local_mask(opponent, h_edges, v_edges) << 4)
+        else:
+            # A distant opponent does not change the moves
+            key = (own, -1, mask)
+
+        moves = self._moves.get(key)
+        if moves is None:
+            moves = self._moves[key] = self._build(*key)
+        return moves
+
+    def _build(self, own, opponent, mask):
+        moves = []
+        for d, target in enumerate(self.steps[own]):
+            if (mask >> d) & 1:
+                continue
+            if target != opponent:
+                moves.append(target)
+                continue
+
+            # Straight jump over the opponent
+            jump = self.steps[opponent][d]
+            if not (mask >> (4 + d)) & 1:
+                moves.append(jump)
+                continue
+
+            # Jump walled off or off the board: sidestep around the opponent
+            for side in _PERPENDICULAR[d]:
+                if not (mask >> (4 + side)) & 1:
+                    moves.append(self.steps[opponent][side])
+
+        return tuple(moves)
+
+
+_TABLES = {}
+
+
+def get_pawn_move_table(geometry):
+    """
+    Return the shared move table for a board geometry.
+    """
+    table = _TABLES.get(geometry.size)
+    if table is None:
+        table = _TABLES[geometry.size] = PawnMoveTable(geometry)
+    return table
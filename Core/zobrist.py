@@ -0,0 +1,56 @@
+"""
+Zobrist keys for Board positions.
+
+A position key is the xor of one random 64-bit value per pawn square (per
+player), per placed wall slot, per walls_left count (per player), plus a
+side-to-move value when it is P2's turn. Board keeps the key up to date
+incrementally; compute_key rebuilds it from scratch.
+"""
+import random
+
+
+class ZobristKeys:
+    def __init__(self, geometry, max_walls, seed=0x51D0):
+        rng = random.Random(seed)
+
+        self.pawn = {
+            player: {pos: rng.getrandbits(64) for pos in geometry.squares}
+            for player in ("P1", "P2")
+        }
+        self.wall = [rng.getrandbits(64) for _ in geometry.wall_slots]
+        self.walls_left = {
+            player: [rng.getrandbits(64) for _ in range(max_walls + 1)]
+            for player in ("P1", "P2")
+        }
+        self.side = rng.getrandbits(64)
+
+    def wall_key(self, wall_slots):
+        key = 0
+        for slot in wall_slots:
+            key ^= self.wall[slot]
+        return key
+
+    def compute_key(self, board):
+        """
+        Full key of board, for positions built without incremental updates.
+        """
+        key = self.wall_key(board.wall_slots)
+        for player in ("P1", "P2"):
+            key ^= self.pawn[player][board.pawns[player]]
+            key ^= self.walls_left[player][board.walls_left[player]]
+        if board.current_player == "P2":
+            key ^= self.side
+        return key
+
+
+_KEYS = {}
+
+
+def get_zobrist(geometry, max_walls):
+    """
+    Return the shared key tables for a board geometry and wall count.
+    """
+    keys = _KEYS.get((geometry.size, max_walls))
+    if keys is None:
+        keys = _KEYS[(geometry.size, max_walls)] = ZobristKeys(geometry, max_walls)
+    return keys
@@ -3,6 +3,7 @@ from PyQt5.QtGui import *
 from PyQt5.QtWidgets import *
 from Core.board import Board
 from Core.game_state import GameState
+from Core.moves import decode_move
 import sys
 import os
 
@@ -16,10 +17,13 @@ class BoardView(QWidget):
     backToMenu = pyqtSignal()
     GRID_SIZE = 9
 
-    def __init__(self, mode, difficulty="easy"):
+    def __init__(self, mode, difficulty="easy", grid_size=9):
         super().__init__()
         self.mode = mode
         self.difficulty = difficulty
+        self.GRID_SIZE = grid_size
+        # Shrink the cells on larger boards so the window still fits
+        self.cell_size = 68 * 9 // grid_size
 
         # Initialize stacks
         self.undo_stack = []  # Stack of GameState objects
@@ -46,7 +50,7 @@ class BoardView(QWidget):
 
         self.cells = {}
         self.wall_labels = []
-        self.board_created = Board(self.mode == 'AI')
+        self.board_created = Board(self.mode == 'AI', self.GRID_SIZE)
 
         # Make window frameless
         self.setWindowFlags(Qt.FramelessWindowHint)
@@ -116,8 +120,8 @@ class BoardView(QWidget):
         grid_layout = QGridLayout()
         grid_layout.setSpacing(10)
 
-        tile_style = """
-        QPushButton {
+        tile_style = f"""
+        QPushButton {{
             background: qlineargradient(
                 x1:0, y1:0, x2:0, y2:1,
                 stop:0 #FFE4F5,
@@ -125,16 +129,16 @@ class BoardView(QWidget):
             );
             border: 2px solid #F06292;
             border-radius: 16px;
-            min-width: 68px;
-            min-height: 68px;
-        }
-        QPushButton:hover {
+            min-width: {self.cell_size}px;
+            min-height: {self.cell_size}px;
+        }}
+        QPushButton:hover {{
             background: #FFD6E8;
             border: 2px solid #EC407A;
-        }
+        }}
         """
 
-        # Create cells (9x9)
+        # Create cells (GRID_SIZE x GRID_SIZE)
         for r in range(self.GRID_SIZE):
             for c in range(self.GRID_SIZE):
                 btn = QPushButton()
@@ -713,8 +717,8 @@ class BoardView(QWidget):
         """
         btn = self.cells[(row, col)]
         btn.setGraphicsEffect(None)
-        btn.setStyleSheet("""
-        QPushButton {
+        btn.setStyleSheet(f"""
+        QPushButton {{
             background: qlineargradient(
                 x1:0, y1:0, x2:0, y2:1,
                 stop:0 #FFE4F5,
@@ -722,9 +726,9 @@ class BoardView(QWidget):
             );
             border: 2px solid #F06292;
             border-radius: 16px;
-            min-width: 68px;
-            min-height: 68px;
-        }
+            min-width: {self.cell_size}px;
+            min-height: {self.cell_size}px;
+        }}
         """)
         self.addShadow(btn, blur=10, x=3, y=3)
 
@@ -743,10 +747,10 @@ class BoardView(QWidget):
                 stop:0.35 {base_color},
                 stop:1 #880E4F
             );
-            border-radius: 34px;
+            border-radius: {self.cell_size // 2}px;
             border: 4px solid #FFF0F7;
-            min-width: 68px;
-            min-height: 68px;
+            min-width: {self.cell_size}px;
+            min-height: {self.cell_size}px;
         }}
         """)
 
@@ -785,7 +789,7 @@ class BoardView(QWidget):
         self.wall_labels.clear()
 
         # Create new board
-        self.board_created = Board(self.mode == 'AI')
+        self.board_created = Board(self.mode == 'AI', self.GRID_SIZE)
         if self.mode == "AI":
             self.ai_player_obj = AIPlayer(
                 player="P2",
@@ -902,8 +906,8 @@ class BoardView(QWidget):
         """
         Check if player reached their goal
         """
-        # P1 needs to reach row 8 (bottom)
-        if player == "P1" and row == 8:
+        # P1 needs to reach the last row (bottom)
+        if player == "P1" and row == self.GRID_SIZE - 1:
             return "P1"
         # P2 needs to reach row 0 (top)
         elif player == "P2" and row == 0:
@@ -997,17 +1001,18 @@ class BoardView(QWidget):
             self.ai_processing = False
 
     def executeAction(self, action):
-        """Execute an action (move or wall)"""
+        """Execute an action (integer move code: move or wall)"""
         current_player = self.board_created.current_player
         color = "#F48FB1"  # AI color
+        move = decode_move(action, self.board_created.geometry)
 
-        if action["type"] == "move":
+        if move[0] == "move":
             old_r, old_c = self.board_created.pawns[current_player]
 
-            moved = self.board_created.move_pawn(current_player, action["to"])
+            moved = self.board_created.move_pawn(current_player, move[1])
             if moved:
                 self.clearCell(old_r, old_c)
-                r, c = action["to"]
+                r, c = move[1]
                 self.placePawn(r, c, color)
                 self.label_turn.setText(f"Current Turn: {self.board_created.current_player}")
 
@@ -1015,12 +1020,11 @@ class BoardView(QWidget):
                 if winner:
                     self.showSimpleWinner(winner)
 
-        elif action["type"] == "wall":
-            placed = self.board_created.place_wall(
-                current_player, action["x"], action["y"], action["orientation"]
-            )
+        elif move[0] == "wall":
+            _, x, y, orientation = move
+            placed = self.board_created.place_wall(current_player, x, y, orientation)
             if placed:
-                self.drawWall(action["x"], action["y"], action["orientation"], current_player)
+                self.drawWall(x, y, orientation, current_player)
                 self.label_turn.setText(f"Current Turn: {self.board_created.current_player}")
                 self.updateWallsLabel()
 
@@ -5,8 +5,12 @@ import sys
 from GUI.board_screen import BoardView
 
 class MainWindow(QMainWindow):
+    # Board sizes offered by the size button, standard 9x9 first
+    BOARD_SIZES = (9, 11, 13)
+
     def __init__(self):
         super().__init__()
+        self.board_size = self.BOARD_SIZES[0]
         self.setWindowTitle("Quoridor Game")
 
         central_widget = QWidget()
@@ -46,6 +50,7 @@ class MainWindow(QMainWindow):
 
         self.ai_player = QPushButton("Play vs AI")
         self.human_player = QPushButton("Play vs Human")
+        self.size_btn = QPushButton(self.sizeText())
         self.easy_btn = QPushButton("EASY")
         self.medium_btn = QPushButton("MEDIUM")
         self.hard_btn = QPushButton("HARD")
@@ -96,6 +101,7 @@ class MainWindow(QMainWindow):
 
         self.ai_player.clicked.connect(self.show_difficulty_options)
         self.human_player.clicked.connect(self.open_human_mode)
+        self.size_btn.clicked.connect(self.cycle_board_size)
         layout.addWidget(button_container, alignment=Qt.AlignCenter)
         layout.addStretch()  # pushes everything up if window is taller
 
@@ -290,11 +296,14 @@ class MainWindow(QMainWindow):
         """
         self.ai_player.setStyleSheet(button_style)
         self.human_player.setStyleSheet(button_style)
+        self.size_btn.setStyleSheet(button_style)
         self.addShadow(self.ai_player, blur=25, x=0, y=8)
         self.addShadow(self.human_player, blur=25, x=0, y=8)
+        self.addShadow(self.size_btn, blur=25, x=0, y=8)
 
         layout.addWidget(self.ai_player)
         layout.addWidget(self.human_player)
+        layout.addWidget(self.size_btn)
         # ===== Difficulty Buttons Layout =====
         self.difficulty_layout = QVBoxLayout()
         self.difficulty_layout.setAlignment(Qt.AlignCenter)
@@ -349,6 +358,7 @@ class MainWindow(QMainWindow):
             btn.hide()
         self.ai_player.show()
         self.human_player.show()
+        self.size_btn.show()
 
     # ===== Utilities =====
     def addShadow(self, widget, blur=20, x=0, y=6):
@@ -375,14 +385,23 @@ class MainWindow(QMainWindow):
         self.show_difficulty_options()
 
     def open_human_mode(self):
-        self.board = BoardView("HUMAN")
+        self.board = BoardView("HUMAN", grid_size=self.board_size)
         self.board.backToMenu.connect(self.show)
         self.board.show()
         self.close()
 
+    def sizeText(self):
+        return f"Board: {self.board_size}x{self.board_size}"
+
+    def cycle_board_size(self):
+        i = self.BOARD_SIZES.index(self.board_size)
+        self.board_size = self.BOARD_SIZES[(i + 1) % len(self.BOARD_SIZES)]
+        self.size_btn.setText(self.sizeText())
+
     def show_difficulty_options(self):
         self.ai_player.hide()
         self.human_player.hide()
+        self.size_btn.hide()
         self.back_btn.show()
         for btn in [self.easy_btn, self.medium_btn, self.hard_btn]:
             btn.show()
@@ -390,7 +409,7 @@ class MainWindow(QMainWindow):
     def start_ai(self, difficulty):
         from Ai.ai_player import AIPlayer
         self.ai_player_obj = AIPlayer("P2", difficulty)
-        self.board = BoardView("AI", difficulty=difficulty)
+        self.board = BoardView("AI", difficulty=difficulty, grid_size=self.board_size)
         self.board.backToMenu.connect(self.show)
         self.board.show()
         self.close()
@@ -0,0 +1,76 @@
+# bench_board_size.py
+# Shows how move generation and search cost grow with the board size.
+# Run from the repository root: python -m benchmarks.bench_board_size [sizes...]
+import random
+import sys
+import time
+
+from Core.board import Board
+from Ai.ai_player import AIPlayer
+from Ai.heuristics import heuristic
+from Ai.minimax import get_possible_moves, winner
+
+
+def sample_positions(size, games=10, plies=30, seed=1):
+    """
+    Play seeded random games on a size x size board and snapshot every position.
+    """
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(games):
+        board = Board(grid_size=size)
+        for _ in range(plies):
+            moves = get_possible_moves(board, board.current_player)
+            walls = [m for m in moves if m >= board.geometry.num_squares]
+            if walls and rng.random() < 0.4:
+                move = rng.choice(walls)
+            else:
+                move = rng.choice(moves)
+            board.make_move(move)
+            if winner(board):
+                break
+            positions.append(board.copy())
+    return positions
+
+
+def per_call(func, items):
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def search_time(boards, difficulty):
+    # AIPlayer.choose_action on a few positions, seconds per move
+    start = time.perf_counter()
+    for board in boards:
+        AIPlayer(board.current_player, difficulty).choose_action(board)
+    return (time.perf_counter() - start) / len(boards)
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [9, 11, 13]
+
+    print("%5s %7s %12s %12s %12s %12s" % (
+        "size", "moves", "movegen us", "eval us", "medium s", "hard s"))
+    for size in sizes:
+        boards = sample_positions(size)
+        moves = sum(len(get_possible_moves(b, b.current_player)) for b in boards) / len(boards)
+
+        # Fresh copies so cached legal wall sets do not flatter move generation
+        fresh = [b.copy() for b in boards]
+        for b in fresh:
+            b._legal_walls = None
+        movegen = per_call(lambda b: get_possible_moves(b, b.current_player), fresh)
+        evaluation = per_call(heuristic, boards)
+
+        searched = boards[::max(1, len(boards) // 6)][:6]
+        medium = search_time(searched, "medium")
+        hard = search_time(searched[:2], "hard")
+
+        print("%5d %7.1f %12.1f %12.1f %12.3f %12.3f" % (
+            size, moves, movegen, evaluation, medium, hard))
+
+
+if __name__ == "__main__":
+    main()
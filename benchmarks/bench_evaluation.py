@@ -0,0 +1,48 @@
+# bench_evaluation.py
+# Per-leaf cost of the evaluation entry points on positions from seeded random games.
+# Run from the repository root: python -m benchmarks.bench_evaluation
+import sys
+import time
+
+from Core.bitboard import BitBoard
+from Core.pathfinding import distance_cache
+from Ai.heuristics import evaluate, raw_heuristic
+from benchmarks.bench_board_size import sample_positions
+
+
+def per_leaf(func, boards, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for board in boards:
+            func(board)
+        best = min(best, time.perf_counter() - start)
+    return best / len(boards) * 1e6
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 9
+    boards = sample_positions(size, games=20, plies=40)
+    bit_boards = [BitBoard.from_board(b) for b in boards]
+
+    for board in boards:
+        assert evaluate(board) == raw_heuristic(board)
+
+    print("%d positions on %dx%d" % (len(boards), size, size))
+    # BitBoards have no distance fields; with the path cache disabled every
+    # leaf pays for two A* searches, as the original heuristic did
+    max_entries = distance_cache.max_entries
+    distance_cache.max_entries = 0
+    try:
+        a_star = per_leaf(raw_heuristic, bit_boards)
+    finally:
+        distance_cache.max_entries = max_entries
+        distance_cache.clear()
+
+    print("%-34s %8.2f us/leaf" % ("raw_heuristic (A* on BitBoard)", a_star))
+    print("%-34s %8.2f us/leaf" % ("raw_heuristic (distance fields)", per_leaf(raw_heuristic, boards)))
+    print("%-34s %8.2f us/leaf" % ("evaluate (single pass)", per_leaf(evaluate, boards)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# bench_reachability.py
+# Compares goal-row reachability backends on positions from seeded random games.
+# Run from the repository root: python -m benchmarks.bench_reachability
+import random
+import sys
+import time
+
+from Core.board import Board
+from Core.bitboard import flood_reaches_row, reaches_row
+from Core.pathfinding import find_path, path_exists
+from Ai.minimax import get_possible_moves
+
+
+def sample_positions(games=40, seed=1):
+    """
+    Play seeded random games that favour walls and snapshot every position.
+    """
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(games):
+        board = Board()
+        for _ in range(60):
+            moves = get_possible_moves(board, board.current_player)
+            if not moves:
+                break
+            walls = [m for m in moves if m >= board.geometry.num_squares]
+            if walls and rng.random() < 0.5:
+                move = rng.choice(walls)
+            else:
+                move = rng.choice(moves)
+            board.make_move(move)
+            if board.pawns["P1"][0] == 8 or board.pawns["P2"][0] == 0:
+                break
+            positions.append(board.copy())
+    return positions
+
+
+def bench(name, func, queries, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for query in queries:
+            func(*query)
+        best = min(best, time.perf_counter() - start)
+    print("%-24s %8.2f us/query" % (name, best / len(queries) * 1e6))
+
+
+def bench_can_place_wall(boards, flood_fill):
+    Board.FLOOD_FILL = flood_fill
+    calls = 0
+    start = time.perf_counter()
+    for board in boards:
+        for x, y, o in board.geometry.wall_slots:
+            board._paths = {"P1": None, "P2": None}
+            board.can_place_wall(x, y, o)
+            calls += 1
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    boards = sample_positions(games)
+    print("%d positions" % len(boards))
+
+    set_queries = []
+    bit_queries = []
+    for board in boards:
+        for player, goal_row in (("P1", 8), ("P2", 0)):
+            r, c = board.pawns[player]
+            set_queries.append((board.pawns[player], goal_row, board.blocked_edges, 9))
+            bit_queries.append((r * 9 + c, goal_row, board.h_edges, board.v_edges))
+
+    bench("find_path", find_path, set_queries)
+    bench("path_exists", path_exists, set_queries)
+    bench("bitboard.reaches_row", reaches_row, bit_queries)
+    bench("flood_reaches_row", flood_reaches_row, bit_queries)
+
+    flood_fill = Board.FLOOD_FILL
+    try:
+        bfs = bench_can_place_wall(boards, False)
+        flood = bench_can_place_wall(boards, True)
+    finally:
+        Board.FLOOD_FILL = flood_fill
+    print("%-24s %8.2f us/call" % ("can_place_wall (BFS)", bfs))
+    print("%-24s %8.2f us/call" % ("can_place_wall (flood)", flood))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# build_tablebase.py
+# Solves every position reachable on a small board by retrograde analysis
+# and writes the result as a tablebase file for Ai.tablebase.
+# Run from the repository root:
+#     python -m tools.build_tablebase --size 5 --walls 1 --output tb_5x5_w1.qtb
+import argparse
+import time
+from array import array
+from collections import deque
+
+from Core.board import Board
+from Core.codec import encode_position
+from Core.frozen_board import FrozenBoard
+from Ai.race_solver import LOSS, WIN
+from Ai.tablebase import write_tablebase
+
+
+def enumerate_positions(grid_size, max_walls):
+    """
+    Breadth-first walk of every position reachable from the start.
+    Returns (positions, edge offsets, edge targets); the children of
+    positions[i] are targets[offsets[i]:offsets[i + 1]]. Finished games
+    have no children.
+    """
+    start = FrozenBoard.from_board(Board(grid_size=grid_size, max_walls=max_walls))
+    num_squares = grid_size * grid_size
+    last_row = num_squares - grid_size
+
+    index = {start: 0}
+    positions = [start]
+    offsets = array("I", [0])
+    targets = array("I")
+
+    queue = deque([start])
+    while queue:
+        position = queue.popleft()
+        p1, p2 = position.pawn_squares
+        if p1 < last_row and p2 >= grid_size:
+            for move in position.legal_moves():
+                child = position.apply_move(move)
+                i = index.get(child)
+                if i is None:
+                    i = index[child] = len(positions)
+                    positions.append(child)
+                    queue.append(child)
+                targets.append(i)
+        offsets.append(len(targets))
+
+    return positions, offsets, targets
+
+
+def solve(positions, offsets, targets):
+    """
+    Retrograde analysis over the position graph, as in Ai.race_solver.
+    Returns (outcome, plies) arrays for the side to move.
+    """
+    n = len(positions)
+    outcome = bytearray(n)
+    plies = array("H", bytes(2 * n))
+    remaining = array("I", (offsets[i + 1] - offsets[i] for i in range(n)))
+
+    # Predecessors in the same offsets/targets layout
+    counts = array("I", bytes(4 * (n + 1)))
+    for t in targets:
+        counts[t + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+    fill = array("I", counts)
+    parents = array("I", bytes(4 * len(targets)))
+    for i in range(n):
+        for t in targets[offsets[i]:offsets[i + 1]]:
+            parents[fill[t]] = i
+            fill[t] += 1
+
+    # Finished games are lost for the side to move: the opponent just won.
+    # Stuck positions without a finished game stay undecided.
+    grid_size = positions[0].grid_size
+    last_row = grid_size * grid_size - grid_size
+    queue = deque()
+    for i in range(n):
+        p1, p2 = positions[i].pawn_squares
+        if p1 >= last_row or p2 < grid_size:
+            outcome[i] = LOSS
+            queue.append(i)
+
+    while queue:
+        s = queue.popleft()
+        lost = outcome[s] == LOSS
+        d = plies[s] + 1
+        for parent in parents[counts[s]:counts[s + 1]]:
+            if outcome[parent]:
+                continue
+            if lost:
+                outcome[parent] = WIN
+                plies[parent] = d
+                queue.append(parent)
+            else:
+                remaining[parent] -= 1
+                if not remaining[parent]:
+                    outcome[parent] = LOSS
+                    plies[parent] = d
+                    queue.append(parent)
+
+    return outcome, plies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a Quoridor tablebase")
+    parser.add_argument("--size", type=int, default=5, help="board size (default 5)")
+    parser.add_argument("--walls", type=int, default=1, help="walls per player (default 1)")
+    parser.add_argument("--output", default=None, help="output file")
+    args = parser.parse_args()
+
+    output = args.output or "tb_%dx%d_w%d.qtb" % (args.size, args.size, args.walls)
+
+    started = time.perf_counter()
+    positions, offsets, targets = enumerate_positions(args.size, args.walls)
+    print("%d positions, %d moves (%.1fs)" % (
+        len(positions), len(targets), time.perf_counter() - started))
+
+    outcome, plies = solve(positions, offsets, targets)
+    print("%d won, %d lost, %d drawn for the side to move" % (
+        outcome.count(WIN), outcome.count(LOSS), outcome.count(0)))
+
+    write_tablebase(output, args.size, args.walls, (
+        (encode_position(p), outcome[i], plies[i]) for i, p in enumerate(positions)
+    ))
+    print("wrote %s (%.1fs)" % (output, time.perf_counter() - started))
+
+
+if __name__ == "__main__":
+    main()
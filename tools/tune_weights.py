@@ -0,0 +1,177 @@
+# tune_weights.py
+# Fits the evaluation weights of Ai/heuristics.py to self-play results
+# (Texel tuning). Needs NumPy. The weights go to tuned_weights.json unless
+# --install is given; --install writes Ai/weights.json, which heuristics
+# loads at startup, so it changes how every later AI game plays.
+# Run from the repository root:
+#     python -m tools.tune_weights --games 200 --workers 4
+import argparse
+import os
+import random
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from Core.board import Board
+from Ai import heuristics
+from Ai.minimax import get_best_move, get_possible_moves, winner
+from Ai.race_solver import race_score
+
+
+# Columns of the feature arrays, as returned by heuristics.evaluation_features
+FEATURES = ("path", "mobility", "walls")
+
+
+def play_game(job):
+    """
+    One self-play game. The first random_plies plies are random pawn moves
+    so games from different seeds differ; the rest are get_best_move at
+    the given difficulty. Returns [(features, result)] for the positions
+    after the opening, result 1.0 if P1 won and 0.0 if P2 won, or [] if
+    the game hit max_plies.
+    """
+    seed, grid_size, difficulty, random_plies, max_plies = job
+    rng = random.Random(seed)
+    board = Board(grid_size=grid_size)
+    positions = []
+
+    for ply in range(max_plies):
+        if winner(board) is not None:
+            break
+        player = board.current_player
+
+        if ply < random_plies:
+            move = rng.choice(list(board.pawn_move_squares(player)))
+        else:
+            # Races without walls are solved exactly, not evaluated
+            if race_score(board) is None:
+                positions.append(heuristics.evaluation_features(board))
+            move = get_best_move(board, player, difficulty)[0]
+            if move is None:
+                move = get_possible_moves(board, player)[0]
+        board.make_move(move)
+
+    won = winner(board)
+    if won is None:
+        return []
+    result = 1.0 if won == "P1" else 0.0
+    return [(features, result) for features in positions]
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def logistic_loss(scores, results):
+    """
+    Mean cross-entropy of sigmoid(scores) against the game results.
+    """
+    p = np.clip(_sigmoid(scores), 1e-12, 1 - 1e-12)
+    return float(-np.mean(results * np.log(p) + (1 - results) * np.log(1 - p)))
+
+
+def fit_logistic(features, results, offset=0.0, iterations=50, ridge=1e-6):
+    """
+    Coefficients b minimising logistic_loss(features @ b + offset, results),
+    by Newton's method. No intercept: a position scored 0 is an even game.
+    """
+    n, k = features.shape
+    b = np.zeros(k)
+    for _ in range(iterations):
+        p = _sigmoid(features @ b + offset)
+        gradient = features.T @ (p - results) / n + ridge * b
+        hessian = (features.T * (p * (1 - p))) @ features / n + ridge * np.eye(k)
+        step = np.linalg.solve(hessian, gradient)
+        b -= step
+        if np.abs(step).max() < 1e-10:
+            break
+    return b
+
+
+def tune(features, results, weights):
+    """
+    Texel tuning. The scale K mapping scores to win probability,
+    sigmoid(K * score), is fitted for the current weights first and then
+    kept, so the tuned weights stay in the units of the current ones.
+    A feature that never varies says nothing about its weight, so it keeps
+    the current one. Returns (K, tuned weights, mask of the fitted features).
+    """
+    scores = features @ weights
+    k = fit_logistic(scores[:, None], results)[0]
+
+    varies = features.std(axis=0) > 0
+    tuned = weights.copy()
+    if varies.any():
+        fixed = features[:, ~varies] @ weights[~varies] * k
+        tuned[varies] = fit_logistic(features[:, varies] * k, results, fixed)
+    return k, tuned, varies
+
+
+def _arrays(games):
+    samples = [sample for game in games for sample in game]
+    features = np.array([s[0] for s in samples], dtype=float).reshape(-1, len(FEATURES))
+    results = np.array([s[1] for s in samples], dtype=float)
+    return features, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the evaluation weights by self-play")
+    parser.add_argument("--games", type=int, default=200, help="self-play games (default 200)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--difficulty", default="medium",
+                        help="get_best_move difficulty (default medium; easy never places walls)")
+    parser.add_argument("--size", type=int, default=9, help="board size (default 9)")
+    parser.add_argument("--random-plies", type=int, default=6, help="random opening plies (default 6)")
+    parser.add_argument("--max-plies", type=int, default=200, help="plies before a game is dropped")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the first game")
+    parser.add_argument("--holdout", type=float, default=0.2,
+                        help="fraction of games kept out of the fit to measure it (default 0.2)")
+    parser.add_argument("--output", default="tuned_weights.json",
+                        help="weights file (default tuned_weights.json)")
+    parser.add_argument("--install", action="store_true",
+                        help="write %s, which the AI loads at startup" % heuristics.WEIGHTS_FILE)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    jobs = [(args.seed + i, args.size, args.difficulty, args.random_plies, args.max_plies)
+            for i in range(args.games)]
+    with Pool(args.workers) as pool:
+        # In job order, so the held-out games depend only on the seeds
+        games = [game for game in pool.imap(play_game, jobs) if game]
+    print("%d games finished, %d positions (%.1fs)" % (
+        len(games), sum(len(game) for game in games), time.perf_counter() - started))
+
+    split = len(games) - int(round(len(games) * args.holdout))
+    train_features, train_results = _arrays(games[:split])
+    test_features, test_results = _arrays(games[split:])
+    if not len(train_results) or not len(test_results):
+        print("not enough games to fit and hold out; play more games")
+        return
+
+    weights = np.array([heuristics.PATH_WEIGHT, heuristics.MOBILITY_WEIGHT,
+                        heuristics.WALL_WEIGHT], dtype=float)
+    k, tuned, varies = tune(train_features, train_results, weights)
+    print("K = %.5f" % k)
+    for name, old, new, fitted in zip(FEATURES, weights, tuned, varies):
+        note = "" if fitted else "  (no variation in the games, kept)"
+        print("%-9s %8.3f -> %8.3f%s" % (name, old, new, note))
+
+    for label, features, results in (("train", train_features, train_results),
+                                      ("held-out", test_features, test_results)):
+        print("%-8s loss %.5f -> %.5f (%d positions)" % (
+            label, logistic_loss(features @ weights * k, results),
+            logistic_loss(features @ tuned * k, results), len(results)))
+
+    if logistic_loss(test_features @ tuned * k, test_results) \
+            >= logistic_loss(test_features @ weights * k, test_results):
+        print("tuned weights do not improve the held-out loss; nothing written")
+        return
+
+    output = heuristics.WEIGHTS_FILE if args.install else args.output
+    heuristics.save_weights(output, *(round(float(w), 4) for w in tuned))
+    print("wrote %s" % output)
+
+
+if __name__ == "__main__":
+    main()